@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import re
 import shutil
@@ -28,6 +29,18 @@ class CodesignResult:
 _DEFAULT_STABLE_IDENTITY_NAME = "CGP Cursor Patch"
 
 
+@functools.lru_cache(maxsize=1)
+def _codesign_bin() -> Optional[str]:
+    """Locate the codesign binary (looked up once per process)."""
+    return shutil.which("codesign")
+
+
+@functools.lru_cache(maxsize=1)
+def _xattr_bin() -> Optional[str]:
+    """Locate the xattr binary (looked up once per process)."""
+    return shutil.which("xattr")
+
+
 def _parse_security_identities(output: str) -> List[str]:
     """Extract identity display names from `security find-identity` output."""
     out: List[str] = []
@@ -98,7 +111,13 @@ def _find_app_bundle(app_root: Path) -> Optional[Path]:
     Walks up the directory tree looking for a directory ending in .app
     that contains Contents/Info.plist.
     """
-    current = app_root.resolve()
+    return _find_app_bundle_cached(str(app_root.resolve()))
+
+
+@functools.lru_cache(maxsize=1024)
+def _find_app_bundle_cached(resolved: str) -> Optional[Path]:
+    """Upward .app search for an already-resolved path (memoized per process)."""
+    current = Path(resolved)
     # Walk up at most 6 levels
     for _ in range(6):
         if current.name.endswith(".app") and (current / "Contents" / "Info.plist").exists():
@@ -138,7 +157,7 @@ def codesign_app(app_root: Path) -> CodesignResult:
         result.skipped_reason = "not macOS"
         return result
 
-    codesign_bin = shutil.which("codesign")
+    codesign_bin = _codesign_bin()
     if not codesign_bin:
         result.needed = True
         result.error = "codesign binary not found"
@@ -204,7 +223,7 @@ def remove_quarantine(app_root: Path) -> bool:
     if app_path is None:
         return False
 
-    xattr_bin = shutil.which("xattr")
+    xattr_bin = _xattr_bin()
     if not xattr_bin:
         return False
 
@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
-import json
+import functools
 import os
 import re
+import stat
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from orjson import loads as _json_loads  # type: ignore[import-not-found]
+except ImportError:  # optional speedup; stdlib json is the default
+    from json import loads as _json_loads
 
 ENV_CURSOR_SERVER_DIR = "CGP_CURSOR_SERVER_DIR"
 ENV_CURSOR_GUI_DIR = "CGP_CURSOR_GUI_DIR"
@@ -46,10 +53,8 @@ class CursorInstallation:
         """Return all patchable target files in this installation."""
         targets: List[TargetFile] = []
         for ext_name, info in EXTENSION_TARGETS.items():
-            ext_dir = self.extensions_dir / ext_name
-            if not ext_dir.is_dir():
-                continue
-            js_file = ext_dir / str(info["file"])
+            # is_file() on the script alone also covers a missing extension dir.
+            js_file = self.extensions_dir / ext_name / str(info["file"])
             if js_file.is_file():
                 patches = list(info["patches"]) if isinstance(info["patches"], list) else []
                 targets.append(TargetFile(
@@ -80,16 +85,60 @@ class TargetFile:
     installation: CursorInstallation
 
 
-def _is_cursor_app_root(p: Path) -> bool:
-    """Validate that a directory is a Cursor installation root."""
-    product_json = p / "product.json"
-    if not product_json.is_file():
-        return False
+@functools.lru_cache(maxsize=256)
+def _read_product_json_cached(path: str, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+    """Parse product.json; keyed by (mtime_ns, size) so rewrites invalidate it."""
     try:
-        data = json.loads(product_json.read_text(encoding="utf-8"))
+        with open(path, "rb") as f:
+            data = _json_loads(f.read())
     except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _product_json_key(app_root: Path) -> Optional[Tuple[str, int, int]]:
+    """Cache key (path, mtime_ns, size) for app_root/product.json, or None if not a file."""
+    product_json = app_root / "product.json"
+    try:
+        st = product_json.stat()
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return str(product_json), st.st_mtime_ns, st.st_size
+
+
+def _read_product_json(app_root: Path) -> Optional[Dict[str, Any]]:
+    """Return the parsed product.json of app_root, or None if missing/invalid."""
+    key = _product_json_key(app_root)
+    if key is None:
+        return None
+    return _read_product_json_cached(*key)
+
+
+# Cursor's product.json is large but declares applicationName among its first keys.
+_PRODUCT_JSON_PEEK = 4096
+_RE_CURSOR_APP_NAME = re.compile(rb'"applicationName"\s*:\s*"cursor"\s*[,}]')
+
+
+@functools.lru_cache(maxsize=256)
+def _is_cursor_product_json_cached(path: str, mtime_ns: int, size: int) -> bool:
+    """Accept on a match in the file head; otherwise fall back to a full parse."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_PRODUCT_JSON_PEEK)
+    except OSError:
         return False
-    return data.get("applicationName") == "cursor"
+    if head.lstrip().startswith(b"{") and _RE_CURSOR_APP_NAME.search(head):
+        return True
+    data = _read_product_json_cached(path, mtime_ns, size)
+    return data is not None and data.get("applicationName") == "cursor"
+
+
+def _is_cursor_app_root(p: Path) -> bool:
+    """Validate that a directory is a Cursor installation root."""
+    key = _product_json_key(p)
+    return key is not None and _is_cursor_product_json_cached(*key)
 
 
 def _version_id_from_path(p: Path) -> str:
@@ -103,12 +152,10 @@ def _version_id_from_path(p: Path) -> str:
 
 def _get_server_data_folder_name(app_root: Path) -> str:
     """Read serverDataFolderName from product.json, default to .cursor-server."""
-    product_json = app_root / "product.json"
-    try:
-        data = json.loads(product_json.read_text(encoding="utf-8"))
-        return data.get("serverDataFolderName", ".cursor-server")
-    except Exception:
+    data = _read_product_json(app_root)
+    if data is None:
         return ".cursor-server"
+    return data.get("serverDataFolderName", ".cursor-server")
 
 
 def _preferred_windows_usernames() -> List[str]:
@@ -209,6 +256,33 @@ def _safe_relative_folder_name(raw: str) -> Optional[str]:
     return "/".join(parts)
 
 
+# Threads for probing candidate roots; the work is stat/read-bound.
+_DISCOVERY_WORKERS = min(8, os.cpu_count() or 4)
+
+
+def _probe_app_roots(paths: List[Path]) -> List[bool]:
+    """Run _is_cursor_app_root over paths, concurrently when there are several."""
+    workers = min(_DISCOVERY_WORKERS, len(paths))
+    if workers <= 1:
+        return [_is_cursor_app_root(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_is_cursor_app_root, paths))
+
+
+def _list_server_versions(bin_dir: Path) -> Tuple[Path, ...]:
+    """Return the sorted version directories of a server bin/ directory (empty if missing/unreadable)."""
+    names: List[str] = []
+    try:
+        with os.scandir(bin_dir) as it:
+            for entry in it:
+                # d_type answers this without a stat for everything but symlinks.
+                if entry.is_dir():
+                    names.append(entry.name)
+    except OSError:
+        return ()
+    return tuple(bin_dir / name for name in sorted(names))
+
+
 def discover_server_installations(
     *,
     explicit_dir: Optional[str] = None,
@@ -240,23 +314,27 @@ def discover_server_installations(
 
     home = Path.home()
     for folder_name in sorted(folder_names):
-        bin_dir = home / folder_name / "bin"
-        if not bin_dir.is_dir():
-            continue
-        try:
-            for child in sorted(bin_dir.iterdir()):
-                if child.is_dir() and _is_cursor_app_root(child):
-                    results.append(CursorInstallation(
-                        kind="server",
-                        root=child,
-                        version_id=child.name,
-                    ))
-        except PermissionError:
-            continue
+        children = list(_list_server_versions(home / folder_name / "bin"))
+        for child, ok in zip(children, _probe_app_roots(children)):
+            if ok:
+                results.append(CursorInstallation(
+                    kind="server",
+                    root=child,
+                    version_id=child.name,
+                ))
 
     return results
 
 
+# System-wide Linux GUI install roots (a per-user one under ~/.local is added separately).
+_LINUX_GUI_ROOTS = (
+    "/opt/cursor/resources/app",
+    "/usr/share/cursor/resources/app",
+    "/usr/lib/cursor/resources/app",
+    "/snap/cursor/current/resources/app",
+)
+
+
 def _gui_candidates() -> List[Path]:
     """Return platform-specific candidate paths for Cursor GUI installations."""
     candidates: List[Path] = []
@@ -277,13 +355,8 @@ def _gui_candidates() -> List[Path]:
             ])
     else:
         # Linux
-        candidates.extend([
-            Path("/opt/cursor/resources/app"),
-            Path("/usr/share/cursor/resources/app"),
-            Path("/usr/lib/cursor/resources/app"),
-            Path("/snap/cursor/current/resources/app"),
-            home / ".local/share/cursor/resources/app",
-        ])
+        candidates.extend(Path(p) for p in _LINUX_GUI_ROOTS)
+        candidates.append(home / ".local/share/cursor/resources/app")
         # WSL: detect Windows Cursor installs
         if _is_wsl():
             candidates.extend(_wsl_gui_candidates())
@@ -291,29 +364,33 @@ def _gui_candidates() -> List[Path]:
     return candidates
 
 
+_RE_WSL_KERNEL = re.compile(rb"microsoft|wsl", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1)
 def _is_wsl() -> bool:
-    """Detect if running under WSL."""
+    """Detect if running under WSL (cannot change within a process, so cached)."""
     try:
-        release = Path("/proc/version").read_text()
-        return "microsoft" in release.lower() or "wsl" in release.lower()
+        return _RE_WSL_KERNEL.search(Path("/proc/version").read_bytes()) is not None
     except Exception:
         return False
 
 
 def _wsl_gui_candidates() -> List[Path]:
     """Find Cursor GUI installations in Windows filesystem from WSL."""
-    candidates: List[Path] = []
-    mnt_c = Path("/mnt/c")
-    if not mnt_c.is_dir():
-        return candidates
-    users_dir = mnt_c / "Users"
-    if not users_dir.is_dir():
-        return candidates
+    return list(_wsl_gui_candidates_cached())
 
-    for user_dir in _ordered_wsl_user_dirs(_wsl_user_dirs(users_dir)):
-        candidate = user_dir / "AppData" / "Local" / "Programs" / "cursor" / "resources" / "app"
-        candidates.append(candidate)
-    return candidates
+
+@functools.lru_cache(maxsize=1)
+def _wsl_gui_candidates_cached() -> Tuple[Path, ...]:
+    """Enumerate /mnt/c/Users once per process; the drvfs walk is slow."""
+    users_dir = Path("/mnt/c/Users")
+    if not users_dir.is_dir():
+        return ()
+    return tuple(
+        user_dir / "AppData" / "Local" / "Programs" / "cursor" / "resources" / "app"
+        for user_dir in _ordered_wsl_user_dirs(_wsl_user_dirs(users_dir))
+    )
 
 
 def discover_gui_installations(
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import io
 import json
@@ -76,20 +77,43 @@ def _bundled_cafile() -> Optional[str]:
     return None
 
 
+def make_session_fetch() -> Fetch:
+    """Return a Fetch that shares one SSL context across calls.
+
+    An update run makes several requests in a row; building the context once
+    avoids reloading the CA store for every connection. Once the bundled CA
+    file was needed, later calls use it directly instead of failing first.
+    """
+    state: Dict[str, ssl.SSLContext] = {}
+
+    def fetch(url: str, timeout_s: float, headers: Dict[str, str]) -> bytes:
+        req = urllib.request.Request(url, headers=headers)
+        ctx = state.get("ctx")
+        if ctx is None:
+            ctx = state["ctx"] = ssl.create_default_context()
+        try:
+            with urllib.request.urlopen(req, timeout=timeout_s, context=ctx) as resp:
+                return resp.read()
+        except Exception as e:
+            cafile = _bundled_cafile()
+            if not cafile:
+                raise
+            if not _looks_like_cert_verify_error(e):
+                raise
+            ctx = state["ctx"] = ssl.create_default_context(cafile=cafile)
+            with urllib.request.urlopen(req, timeout=timeout_s, context=ctx) as resp:
+                return resp.read()
+
+    return fetch
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_session_fetch() -> Fetch:
+    return make_session_fetch()
+
+
 def _default_fetch(url: str, timeout_s: float, headers: Dict[str, str]) -> bytes:
-    req = urllib.request.Request(url, headers=headers)
-    try:
-        with urllib.request.urlopen(req, timeout=timeout_s) as resp:
-            return resp.read()
-    except Exception as e:
-        cafile = _bundled_cafile()
-        if not cafile:
-            raise
-        if not _looks_like_cert_verify_error(e):
-            raise
-        ctx = ssl.create_default_context(cafile=cafile)
-        with urllib.request.urlopen(req, timeout=timeout_s, context=ctx) as resp:
-            return resp.read()
+    return _shared_session_fetch()(url, timeout_s, headers)
 
 
 def _http_headers() -> Dict[str, str]:
@@ -147,6 +171,7 @@ def split_repo(repo: str) -> Tuple[str, str]:
     return owner, name
 
 
+@functools.lru_cache(maxsize=64)
 def _parse_version_tuple(v: str) -> Optional[Tuple[int, ...]]:
     s = (v or "").strip()
     if not s:
@@ -302,13 +327,18 @@ def parse_checksums_txt(txt: str) -> Dict[str, str]:
 
 
 def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
     with path.open("rb") as f:
+        file_digest = getattr(hashlib, "file_digest", None)  # Python 3.11+
+        if file_digest is not None:
+            return file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        buf = bytearray(1024 * 1024)
+        view = memoryview(buf)
         while True:
-            chunk = f.read(1024 * 1024)
-            if not chunk:
+            n = f.readinto(buf)
+            if not n:
                 break
-            h.update(chunk)
+            h.update(view[:n])
     return h.hexdigest()
 
 
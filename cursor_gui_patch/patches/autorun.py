@@ -18,6 +18,10 @@ _RE_METHOD_OPEN = re.compile(
     r"(async\s+getTeamAdminSettings\s*\(\s*\)\s*\{)"
 )
 
+# Original: async getTeamAdminSettings(){return(Date.now()-...
+# Patched:  async getTeamAdminSettings(){return void 0/* marker */;return(Date.now()-...
+_INJECTION = f"return void 0/* {_MARKER} */;"
+
 
 class AutoRunPatch(BasePatch):
     @property
@@ -38,16 +42,15 @@ class AutoRunPatch(BasePatch):
             result.already_patched = True
             return content, result
 
-        if not self.is_applicable(content):
+        # Cheap substring gate, then a single regex pass: subn's count doubles as
+        # the is_applicable() check, so the method regex never runs twice.
+        if "getTeamAdminSettings" not in content:
             result.not_applicable = True
             return content, result
 
         # Inject early return right after the method opening brace.
-        # Original: async getTeamAdminSettings(){return(Date.now()-...
-        # Patched:  async getTeamAdminSettings(){return void 0/* marker */;return(Date.now()-...
-        injection = f"return void 0/* {_MARKER} */;"
         new_content, n = _RE_METHOD_OPEN.subn(
-            lambda m: m.group(1) + injection,
+            lambda m: m.group(1) + _INJECTION,
             content,
         )
 
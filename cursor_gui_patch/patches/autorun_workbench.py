@@ -15,6 +15,7 @@ _MARKER = "CGP_PATCH_AUTORUN_WORKBENCH"
 # from ever executing, so the UI stays in user-controlled mode.
 _OLD_ENABLED_CHECK = "r?.autoRunControls?.enabled??!1"
 _NEW_ENABLED_CHECK = "!1"
+_REPLACEMENT = f"{_NEW_ENABLED_CHECK}/* {_MARKER} */"
 
 
 class AutoRunWorkbenchPatch(BasePatch):
@@ -36,15 +37,13 @@ class AutoRunWorkbenchPatch(BasePatch):
             result.already_patched = True
             return content, result
 
-        if not self.is_applicable(content):
+        # One find() serves as both the applicability check and the splice point.
+        idx = content.find(_OLD_ENABLED_CHECK)
+        if idx < 0:
             result.not_applicable = True
             return content, result
 
-        new_content = content.replace(
-            _OLD_ENABLED_CHECK,
-            f"{_NEW_ENABLED_CHECK}/* {_MARKER} */",
-            1,
-        )
+        new_content = content[:idx] + _REPLACEMENT + content[idx + len(_OLD_ENABLED_CHECK):]
 
         result.applied = True
         result.replacements = 1
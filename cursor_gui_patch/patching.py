@@ -46,15 +46,17 @@ def patch(
     report = PatchReport()
 
     for inst in installations:
+        # One filesystem sweep per installation, shared by preflight and patching.
+        targets = inst.target_files()
         if not dry_run and _is_macos_gui_installation(inst):
-            if _installation_has_pending_writes(inst, only_patches=only_patches):
+            if _installation_has_pending_writes(targets, only_patches=only_patches):
                 snap = update_official_app_snapshot(inst.root)
                 if snap.message:
                     report.notes.append(f"[{inst.kind}] {snap.message}")
 
         patched_before = len(report.patched)
         _patch_installation(
-            inst, report,
+            inst, targets, report,
             dry_run=dry_run, force=force, only_patches=only_patches,
         )
         patched_after = len(report.patched)
@@ -76,6 +78,7 @@ def patch(
 
 def _patch_installation(
     inst: CursorInstallation,
+    targets: List[TargetFile],
     report: PatchReport,
     *,
     dry_run: bool,
@@ -93,7 +96,6 @@ def _patch_installation(
     if not dry_run:
         new_cache = {}
 
-    targets = inst.target_files()
     hash_pairs: List[Tuple[str, str]] = []
     patched_before = len(report.patched)
 
@@ -151,7 +153,7 @@ def _is_macos_gui_installation(inst: CursorInstallation) -> bool:
 
 
 def _installation_has_pending_writes(
-    inst: CursorInstallation,
+    targets: List[TargetFile],
     *,
     only_patches: Optional[Set[str]],
 ) -> bool:
@@ -161,7 +163,7 @@ def _installation_has_pending_writes(
     Used by macOS official-app snapshot logic to avoid replacing snapshot when
     current files are already patched and no writes would occur.
     """
-    for target in inst.target_files():
+    for target in targets:
         patch_names = target.patch_names
         if only_patches:
             patch_names = [n for n in patch_names if n in only_patches]
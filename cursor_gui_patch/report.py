@@ -15,18 +15,15 @@ def _is_macos_app_bundle_path(path: Path) -> bool:
     return s.startswith("/Applications/") and ".app/" in s
 
 
-def _has_permission_error(errors: List[Tuple[Path, str]]) -> bool:
-    """Check if any error looks like a permission issue."""
-    for _, msg in errors:
-        low = msg.lower()
-        if (
-            "permission denied" in low
-            or "errno 13" in low
-            or "access is denied" in low
-            or ("operation not permitted" in low and sys.platform == "darwin")
-        ):
-            return True
-    return False
+def _is_permission_error(msg: str) -> bool:
+    """Check if an error message looks like a permission issue."""
+    low = msg.lower()
+    return (
+        "permission denied" in low
+        or "errno 13" in low
+        or "access is denied" in low
+        or ("operation not permitted" in low and sys.platform == "darwin")
+    )
 
 
 def _permission_hint() -> str:
@@ -183,8 +180,11 @@ class PatchReport:
             lines.append("  Approve trusted prompts for /Applications/Cursor.app.")
         if self.errors:
             lines.append(f"Errors: {len(self.errors)}")
+            perm_flag = False
             for path, msg in self.errors:
                 lines.append(f"  {path}: {msg}")
+                if not perm_flag:
+                    perm_flag = _is_permission_error(msg)
             if _looks_like_macos_privacy_error(self.errors):
                 diag = diagnose_macos_privacy_denial(self.errors)
                 lines.append("")
@@ -197,7 +197,7 @@ class PatchReport:
                     f"  confidence: {'certain' if diag.certain else 'likely (not certain)'}"
                 )
                 lines.extend(_macos_privacy_hint("patch"))
-            if _has_permission_error(self.errors):
+            if perm_flag:
                 lines.append("")
                 lines.append(_permission_hint())
         if not self.errors:
@@ -276,8 +276,11 @@ class UnpatchReport:
                 ))
         if self.errors:
             lines.append(f"Errors: {len(self.errors)}")
+            perm_flag = False
             for path, msg in self.errors:
                 lines.append(f"  {path}: {msg}")
+                if not perm_flag:
+                    perm_flag = _is_permission_error(msg)
             if _looks_like_macos_privacy_error(self.errors):
                 diag = diagnose_macos_privacy_denial(self.errors)
                 lines.append("")
@@ -290,7 +293,7 @@ class UnpatchReport:
                     f"  confidence: {'certain' if diag.certain else 'likely (not certain)'}"
                 )
                 lines.extend(_macos_privacy_hint("unpatch"))
-            if _has_permission_error(self.errors):
+            if perm_flag:
                 lines.append("")
                 if sys.platform == "win32":
                     lines.append("Fix: Run as Administrator")
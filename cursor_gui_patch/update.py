@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import shutil
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Tuple
@@ -25,6 +27,7 @@ from .github_release import (
     get_install_root_dir,
     is_frozen_binary,
     is_version_newer,
+    make_session_fetch,
     read_local_runtime_version,
     select_app_asset_name,
     select_release_asset_name,
@@ -50,16 +53,19 @@ def _last_check_path() -> Path:
     return root / ".last-update-check"
 
 
-def _should_check_update() -> bool:
-    """Return True if enough time has passed since the last update check."""
-    p = _last_check_path()
+def _read_last_check_ts() -> Optional[float]:
+    """Return the recorded last-check timestamp, or None if missing/unreadable."""
     try:
-        if p.exists():
-            ts = float(p.read_text(encoding="utf-8").strip())
-            if (time.time() - ts) < UPDATE_CHECK_INTERVAL_S:
-                return False
+        return float(_last_check_path().read_text(encoding="utf-8").strip())
     except Exception:
-        pass
+        return None
+
+
+def _should_check_update() -> bool:
+    """Return True if enough time has passed since the last update check."""
+    ts = _read_last_check_ts()
+    if ts is not None and (time.time() - ts) < UPDATE_CHECK_INTERVAL_S:
+        return False
     return True
 
 
@@ -125,6 +131,18 @@ def check_for_update(
     )
 
 
+@functools.lru_cache(maxsize=1)
+def _which_cgp() -> Optional[str]:
+    """Locate cgp on PATH (cached for the process)."""
+    return shutil.which("cgp")
+
+
+@functools.lru_cache(maxsize=1)
+def _resolved_executable() -> Path:
+    """Resolved path of the running binary (constant for the process)."""
+    return Path(sys.executable).resolve()
+
+
 def _resolve_install_dirs(
     fetch_fn: Optional[Fetch],
 ) -> Tuple[Path, Path]:
@@ -137,7 +155,7 @@ def _resolve_install_dirs(
 
     if not (isinstance(env_dest, str) and env_dest.strip()):
         try:
-            which = shutil.which("cgp")
+            which = _which_cgp()
             if which:
                 bin_dir = Path(which).expanduser().parent
         except Exception:
@@ -145,7 +163,7 @@ def _resolve_install_dirs(
 
     if not (isinstance(env_root, str) and env_root.strip()):
         try:
-            exe = Path(sys.executable).resolve()
+            exe = _resolved_executable()
             exe_name = "cgp.exe" if sys.platform == "win32" else "cgp"
             if exe.name == exe_name and exe.parent.name == "cgp":
                 if exe.parent.parent.name == "current":
@@ -164,12 +182,12 @@ def _try_app_only_update(
     tag: str,
     bin_dir: Path,
     root_dir: Path,
+    local_rv: Optional[str],
     timeout_s: float,
     fetch_fn: Optional[Fetch],
 ) -> Optional[str]:
     """Try an app-only update. Returns version string on success, None if not possible."""
-    # Check if we have a local runtime with RUNTIME_VERSION
-    local_rv = read_local_runtime_version()
+    # Need a local runtime with RUNTIME_VERSION
     if not local_rv:
         return None
 
@@ -194,7 +212,7 @@ def _try_app_only_update(
 
     # Find the existing _internal/ directory
     try:
-        exe = Path(sys.executable).resolve()
+        exe = _resolved_executable()
         existing_internal = exe.parent / "_internal"
         if not existing_internal.is_dir():
             return None
@@ -232,14 +250,19 @@ def perform_update(
     if not is_frozen_binary():
         return False, "not a frozen binary"
 
+    if fetch is None:
+        fetch = make_session_fetch()
+
     repo = get_github_repo()
     try:
-        kwargs = {"timeout_s": timeout_s}
-        if fetch is not None:
-            kwargs["fetch"] = fetch
-        rel = fetch_latest_release(repo, **kwargs)
-
-        bin_dir, root_dir = _resolve_install_dirs(fetch)
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            rel_future = ex.submit(
+                fetch_latest_release, repo, timeout_s=timeout_s, fetch=fetch,
+            )
+            # Local lookups overlap with the GitHub API round-trip.
+            bin_dir, root_dir = _resolve_install_dirs(fetch)
+            local_rv = read_local_runtime_version()
+            rel = rel_future.result()
 
         # Try app-only update first (fast path)
         try:
@@ -248,6 +271,7 @@ def perform_update(
                 tag=rel.tag,
                 bin_dir=bin_dir,
                 root_dir=root_dir,
+                local_rv=local_rv,
                 timeout_s=timeout_s,
                 fetch_fn=fetch,
             )
@@ -268,9 +292,8 @@ def perform_update(
             "bin_dir": bin_dir,
             "timeout_s": timeout_s,
             "verify_checksums": True,
+            "fetch": fetch,
         }
-        if fetch is not None:
-            dl_kwargs["fetch"] = fetch
 
         download_and_install_release_bundle(**dl_kwargs)
         return True, f"updated to {rel.version}"
@@ -289,7 +312,9 @@ def auto_update_if_needed(argv: List[str]) -> None:
     if not _should_check_update():
         return
 
-    status = check_for_update(timeout_s=3.0)
+    # One fetch for the check and the update, so they share the SSL setup.
+    fetch = make_session_fetch()
+    status = check_for_update(timeout_s=3.0, fetch=fetch)
     if not status or not status.update_available:
         return
 
@@ -297,7 +322,7 @@ def auto_update_if_needed(argv: List[str]) -> None:
         f"Updating cgp {__version__} \u2192 {status.remote_version}...",
         file=sys.stderr,
     )
-    ok, msg = perform_update(asset_name=status.asset_name)
+    ok, msg = perform_update(asset_name=status.asset_name, fetch=fetch)
     if not ok:
         print(f"Update failed: {msg}", file=sys.stderr)
         return
@@ -18,23 +18,93 @@ Also writes RUNTIME_VERSION into _internal/ before packaging.
 
 from __future__ import annotations
 
+import bisect
+import functools
+import gzip
 import hashlib
 import os
+import re
+import shutil
+import stat
 import subprocess
 import sys
 import tarfile
 import zipfile
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from io import BufferedWriter, BytesIO
 from pathlib import Path
+from typing import Callable, Iterator, List, NamedTuple, Tuple
 
 
-VALID_PLATFORMS = {
+VALID_PLATFORMS = frozenset({
     "linux-x86_64",
     "linux-arm64",
     "macos-x86_64",
     "macos-arm64",
     "windows-x86_64",
-}
+})
+_VALID_PLATFORMS_STR = ", ".join(sorted(VALID_PLATFORMS))
+# Shared libraries to strip: foo.so, libfoo.so.1.2, foo.dylib
+_SHLIB_RE = re.compile(r"(\.so(\.[0-9]+)*|\.dylib)$")
+
+_STRIP_CHUNK = 500  # files per strip invocation
+_INTERNAL_PREFIX = "_internal/"
+_SMALL_FILE = 64 * 1024  # tar members below this are read in one call
+
+# Already-compressed payloads (e.g. PyInstaller's base_library.zip) are stored
+# as-is in zip archives; deflating them again costs CPU for no size gain.
+_STORED_SUFFIXES = (
+    ".zip", ".whl", ".gz", ".bz2", ".xz", ".zst", ".br",
+    ".png", ".jpg", ".jpeg", ".woff2",
+)
+
+
+# DEFLATE level for zip archives: about twice as fast as the default 6 for
+# slightly larger output.
+ZIP_LEVEL = 1
+
+
+def _walk_files(root: Path) -> Iterator[Tuple["os.DirEntry[str]", str]]:
+    """Yield (entry, relpath) for every entry under root, directories included (unordered).
+
+    Uses os.scandir so is_file()/is_dir() come from the cached DirEntry data.
+    Like Path.rglob, symlinked directories are yielded but not descended into.
+    relpath always uses "/" separators.
+    """
+    def walk(path: str, prefix: str) -> Iterator[Tuple["os.DirEntry[str]", str]]:
+        with os.scandir(path) as it:
+            entries = list(it)
+        for entry in entries:
+            rel = prefix + entry.name
+            yield entry, rel
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk(entry.path, rel + "/")
+
+    yield from walk(str(root), "")
+
+
+class FileRec(NamedTuple):
+    """One walked entry of the build tree."""
+    relpath: str
+    path: str
+    is_file: bool
+    lstat: os.stat_result
+
+
+def _sort_key(relpath: str) -> List[str]:
+    # Component-wise order, i.e. what Path sorting gave: "a/x" before "a.txt"
+    # (case-insensitive on Windows, like WindowsPath).
+    return os.path.normcase(relpath).split(os.sep)
+
+
+def _enumerate(root: Path) -> List[FileRec]:
+    """Walk and sort root once; the list is shared by RUNTIME_VERSION and all archives."""
+    files = [
+        FileRec(rel, entry.path, entry.is_file(), entry.stat(follow_symlinks=False))
+        for entry, rel in _walk_files(root)
+    ]
+    files.sort(key=lambda f: _sort_key(f.relpath))
+    return files
 
 
 def strip_binaries(dist_dir: Path) -> None:
@@ -49,21 +119,23 @@ def strip_binaries(dist_dir: Path) -> None:
     targets = []
     internal = dist_dir / "cgp" / "_internal"
     if internal.exists():
-        for f in internal.rglob("*"):
-            if f.is_file() and (f.suffix in (".so", ".dylib") or ".so." in f.name):
-                targets.append(f)
+        for entry, _ in _walk_files(internal):
+            if entry.is_file() and _SHLIB_RE.search(entry.name):
+                targets.append(Path(entry.path))
 
     exe = dist_dir / "cgp" / "cgp"
     if exe.exists() and exe.is_file():
         targets.append(exe)
 
-    for t in targets:
+    # strip accepts many files per call; chunk to stay well under ARG_MAX.
+    for i in range(0, len(targets), _STRIP_CHUNK):
+        chunk = targets[i:i + _STRIP_CHUNK]
         try:
             subprocess.run(
-                ["strip", str(t)],
+                ["strip", *map(str, chunk)],
                 check=False,
                 capture_output=True,
-                timeout=30,
+                timeout=120,
             )
         except Exception:
             pass
@@ -71,6 +143,7 @@ def strip_binaries(dist_dir: Path) -> None:
     print(f"  Stripped {len(targets)} files", file=sys.stderr)
 
 
+@functools.lru_cache(maxsize=1)
 def _has_strip() -> bool:
     try:
         r = subprocess.run(
@@ -84,134 +157,176 @@ def _has_strip() -> bool:
         return False
 
 
-def compute_runtime_version(internal_dir: Path) -> str:
-    """Compute a hash of all runtime files (names + sizes) to detect changes."""
-    entries = []
-    for f in sorted(internal_dir.rglob("*")):
-        if f.is_file() and f.name != "RUNTIME_VERSION":
-            rel = f.relative_to(internal_dir)
-            size = f.stat().st_size
-            entries.append(f"{rel}:{size}")
-
-    content = "\n".join(entries)
-    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
-
-
-def write_runtime_version(internal_dir: Path) -> str:
-    """Write RUNTIME_VERSION file and return the version string."""
-    version = compute_runtime_version(internal_dir)
+def compute_runtime_version(files: List[FileRec]) -> str:
+    """Compute a hash of all runtime files (names + sizes) to detect changes.
+
+    `files` is the sorted cgp/ listing; only entries under _internal/ count.
+    Contents are deliberately not hashed: rebuilding an unchanged runtime is
+    not guaranteed to give byte-identical files, so a content hash would change
+    on every release and disable app-only updates.
+    """
+    h = hashlib.sha256()
+    sep = b""
+    for f in files:
+        rel = f.relpath
+        if not (f.is_file and rel.startswith(_INTERNAL_PREFIX)):
+            continue
+        if rel.rsplit("/", 1)[-1] == "RUNTIME_VERSION":
+            continue
+        # Symlinked files count with their target's size.
+        st = f.lstat if stat.S_ISREG(f.lstat.st_mode) else os.stat(f.path)
+        # Same bytes as hashing "\n".join(lines), without building the string.
+        h.update(sep)
+        # str(Path) spelled the name with the native separator.
+        name = rel[len(_INTERNAL_PREFIX):].replace("/", os.sep)
+        h.update(f"{name}:{st.st_size}".encode("utf-8"))
+        sep = b"\n"
+
+    return h.hexdigest()[:16]
+
+
+def write_runtime_version(internal_dir: Path, files: List[FileRec]) -> str:
+    """Write RUNTIME_VERSION file, record it in `files`, and return the version."""
+    version = compute_runtime_version(files)
     rv_file = internal_dir / "RUNTIME_VERSION"
     rv_file.write_text(version + "\n", encoding="utf-8")
+
+    rel = _INTERNAL_PREFIX + "RUNTIME_VERSION"
+    files[:] = [f for f in files if f.relpath != rel]
+    keys = [_sort_key(f.relpath) for f in files]
+    files.insert(
+        bisect.bisect(keys, _sort_key(rel)),
+        FileRec(rel, str(rv_file), True, os.lstat(rv_file)),
+    )
+
     print(f"  RUNTIME_VERSION: {version}", file=sys.stderr)
     return version
 
 
-def package_full(dist_dir: Path, output_dir: Path, platform: str) -> Path:
-    """Package the full bundle (cgp/ directory with everything)."""
-    is_windows = "windows" in platform
-    if is_windows:
-        name = f"cgp-{platform}.zip"
-        out = output_dir / name
-        _create_zip(dist_dir, out, "cgp")
+# Archive creator for a platform: (files, out_path, top_dir) -> None
+Creator = Callable[[List[FileRec], Path, str], None]
+
+
+def package(
+    kind: str,
+    files: List[FileRec],
+    output_dir: Path,
+    platform: str,
+    create: Creator,
+    suffix: str,
+) -> Path:
+    """Package one archive kind: "full", "app" (executable) or "runtime" (_internal/)."""
+    if kind == "app":
+        files = _filter_files(files, include_internal=False)
+        name = f"cgp-app-{platform}.{suffix}"
+    elif kind == "runtime":
+        files = _filter_files(files, include_exe=False)
+        name = f"cgp-runtime-{platform}.{suffix}"
     else:
-        name = f"cgp-{platform}.tar.gz"
-        out = output_dir / name
-        _create_tar_gz(dist_dir, out, "cgp")
-    print(f"  Full:    {name} ({_human_size(out)})", file=sys.stderr)
+        name = f"cgp-{platform}.{suffix}"
+    out = output_dir / name
+    create(files, out, "cgp")
     return out
 
 
-def package_app(dist_dir: Path, output_dir: Path, platform: str) -> Path:
-    """Package app-only (just the executable)."""
-    is_windows = "windows" in platform
-    if is_windows:
-        name = f"cgp-app-{platform}.zip"
-        out = output_dir / name
-        _create_zip_filtered(dist_dir, out, "cgp", include_internal=False)
-    else:
-        name = f"cgp-app-{platform}.tar.gz"
-        out = output_dir / name
-        _create_tar_gz_filtered(dist_dir, out, "cgp", include_internal=False)
-    print(f"  App:     {name} ({_human_size(out)})", file=sys.stderr)
+def _filter_files(
+    files: List[FileRec], *, include_internal: bool = True, include_exe: bool = True,
+) -> List[FileRec]:
+    """Select the subset of the walked tree that goes into a split archive."""
+    out = []
+    for f in files:
+        rel = f.relpath
+        if not include_internal and (rel.startswith("_internal/") or rel == "_internal"):
+            continue
+        if not include_exe and f.is_file and "/" not in rel and rel != "_internal":
+            # Skip the top-level executable
+            continue
+        out.append(f)
     return out
 
 
-def package_runtime(dist_dir: Path, output_dir: Path, platform: str) -> Path:
-    """Package runtime-only (just _internal/)."""
-    is_windows = "windows" in platform
-    if is_windows:
-        name = f"cgp-runtime-{platform}.zip"
-        out = output_dir / name
-        _create_zip_filtered(dist_dir, out, "cgp", include_exe=False)
+def _add_tar_member(tf: tarfile.TarFile, f: FileRec, arcname: str) -> None:
+    """Add one walked entry, building its TarInfo from the cached lstat.
+
+    tf.add() would lstat the file again and look up user/group names for
+    every member; regular files, directories and symlinks are all a bundle
+    contains.
+    """
+    st = f.lstat
+    if stat.S_ISREG(st.st_mode):
+        ti = tarfile.TarInfo(arcname)
+        ti.size = st.st_size
+    elif stat.S_ISLNK(st.st_mode):
+        ti = tarfile.TarInfo(arcname)
+        ti.type = tarfile.SYMTYPE
+        ti.linkname = os.readlink(f.path)
+    elif stat.S_ISDIR(st.st_mode):
+        # One entry per directory (contents are separate members), so empty
+        # directories and directory modes survive extraction.
+        ti = tarfile.TarInfo(arcname)
+        ti.type = tarfile.DIRTYPE
     else:
-        name = f"cgp-runtime-{platform}.tar.gz"
-        out = output_dir / name
-        _create_tar_gz_filtered(dist_dir, out, "cgp", include_exe=False)
-    print(f"  Runtime: {name} ({_human_size(out)})", file=sys.stderr)
-    return out
+        tf.add(f.path, arcname=arcname, recursive=False)
+        return
+    ti.mode = stat.S_IMODE(st.st_mode)
+    ti.mtime = st.st_mtime
+    ti.uid = st.st_uid
+    ti.gid = st.st_gid
+    if ti.isreg():
+        with open(f.path, "rb") as fh:
+            if ti.size < _SMALL_FILE:
+                # One read instead of tarfile's copyfileobj loop.
+                tf.addfile(ti, BytesIO(fh.read()))
+            else:
+                tf.addfile(ti, fh)
+    else:
+        tf.addfile(ti)
+
+
+def _write_tar(fileobj, files: List[FileRec], top_dir: str) -> None:
+    """Write an uncompressed tar stream of files (under top_dir/) to fileobj."""
+    with tarfile.open(fileobj=fileobj, mode="w|", bufsize=64 * 1024) as tf:
+        for f in files:
+            _add_tar_member(tf, f, f"{top_dir}/{f.relpath}")
+
+
+def _create_tar_gz(files: List[FileRec], out_path: Path, top_dir: str) -> None:
+    """Create a tar.gz of the given files under top_dir/.
+
+    Compresses with pigz (multi-threaded gzip) when it is on PATH, otherwise
+    in-process; both produce a standard .tar.gz.
+    """
+    pigz = shutil.which("pigz")
+    if pigz:
+        with open(out_path, "wb") as out:
+            proc = subprocess.Popen([pigz, "-c", "-9"], stdin=subprocess.PIPE, stdout=out)
+            try:
+                _write_tar(proc.stdin, files, top_dir)
+            finally:
+                proc.stdin.close()
+                rc = proc.wait()
+        if rc != 0:
+            raise RuntimeError(f"pigz failed with exit code {rc} for {out_path.name}")
+        return
+
+    # Large write buffer below gzip so the file sees few, big writes.
+    with open(out_path, "wb", buffering=0) as raw, \
+         BufferedWriter(raw, buffer_size=1 << 20) as buf, \
+         gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=9) as gz:
+        _write_tar(gz, files, top_dir)
 
 
-def _create_tar_gz(base_dir: Path, out_path: Path, top_dir: str) -> None:
-    """Create a tar.gz of base_dir/top_dir/."""
-    with tarfile.open(str(out_path), "w:gz") as tf:
-        src = base_dir / top_dir
-        for f in sorted(src.rglob("*")):
-            arcname = str(Path(top_dir) / f.relative_to(src))
-            tf.add(str(f), arcname=arcname)
-
-
-def _create_tar_gz_filtered(
-    base_dir: Path, out_path: Path, top_dir: str,
-    *, include_internal: bool = True, include_exe: bool = True,
-) -> None:
-    """Create a filtered tar.gz."""
-    with tarfile.open(str(out_path), "w:gz") as tf:
-        src = base_dir / top_dir
-        for f in sorted(src.rglob("*")):
-            rel = f.relative_to(src)
-            parts = rel.parts
-
-            # Filter based on flags
-            if not include_internal and len(parts) > 0 and parts[0] == "_internal":
-                continue
-            if not include_exe and f.is_file() and len(parts) == 1 and parts[0] != "_internal":
-                # Skip the top-level executable
-                continue
-
-            arcname = str(Path(top_dir) / rel)
-            tf.add(str(f), arcname=arcname)
-
-
-def _create_zip(base_dir: Path, out_path: Path, top_dir: str) -> None:
-    """Create a zip of base_dir/top_dir/."""
-    with zipfile.ZipFile(str(out_path), "w", zipfile.ZIP_DEFLATED) as zf:
-        src = base_dir / top_dir
-        for f in sorted(src.rglob("*")):
-            if f.is_file():
-                arcname = str(Path(top_dir) / f.relative_to(src))
-                zf.write(str(f), arcname=arcname)
-
-
-def _create_zip_filtered(
-    base_dir: Path, out_path: Path, top_dir: str,
-    *, include_internal: bool = True, include_exe: bool = True,
-) -> None:
-    """Create a filtered zip."""
-    with zipfile.ZipFile(str(out_path), "w", zipfile.ZIP_DEFLATED) as zf:
-        src = base_dir / top_dir
-        for f in sorted(src.rglob("*")):
-            if not f.is_file():
-                continue
-            rel = f.relative_to(src)
-            parts = rel.parts
-
-            if not include_internal and len(parts) > 0 and parts[0] == "_internal":
-                continue
-            if not include_exe and len(parts) == 1 and parts[0] != "_internal":
-                continue
-
-            arcname = str(Path(top_dir) / rel)
-            zf.write(str(f), arcname=arcname)
+def _create_zip(files: List[FileRec], out_path: Path, top_dir: str) -> None:
+    """Create a zip of the given files under top_dir/."""
+    with zipfile.ZipFile(
+        str(out_path), "w", zipfile.ZIP_DEFLATED, compresslevel=ZIP_LEVEL,
+    ) as zf:
+        for f in files:
+            if f.is_file:
+                compress_type = (
+                    zipfile.ZIP_STORED if f.relpath.endswith(_STORED_SUFFIXES) else None
+                )
+                zf.write(f.path, arcname=f"{top_dir}/{f.relpath}", compress_type=compress_type)
 
 
 def _human_size(path: Path) -> str:
@@ -226,7 +341,7 @@ def _human_size(path: Path) -> str:
 def main() -> None:
     if len(sys.argv) != 4:
         print(f"Usage: {sys.argv[0]} <dist_dir> <output_dir> <platform>", file=sys.stderr)
-        print(f"  Platforms: {', '.join(sorted(VALID_PLATFORMS))}", file=sys.stderr)
+        print(f"  Platforms: {_VALID_PLATFORMS_STR}", file=sys.stderr)
         sys.exit(1)
 
     dist_dir = Path(sys.argv[1]).resolve()
@@ -235,7 +350,7 @@ def main() -> None:
 
     if platform not in VALID_PLATFORMS:
         print(f"Invalid platform: {platform}", file=sys.stderr)
-        print(f"  Valid: {', '.join(sorted(VALID_PLATFORMS))}", file=sys.stderr)
+        print(f"  Valid: {_VALID_PLATFORMS_STR}", file=sys.stderr)
         sys.exit(1)
 
     cgp_dir = dist_dir / "cgp"
@@ -252,14 +367,27 @@ def main() -> None:
     # 1. Strip debug symbols
     strip_binaries(dist_dir)
 
-    # 2. Write RUNTIME_VERSION
+    # 2. Walk the bundle once, then write RUNTIME_VERSION from that listing
+    files = _enumerate(cgp_dir)
     if internal_dir.exists():
-        write_runtime_version(internal_dir)
+        write_runtime_version(internal_dir, files)
 
-    # 3. Package archives
-    package_full(dist_dir, output_dir, platform)
-    package_app(dist_dir, output_dir, platform)
-    package_runtime(dist_dir, output_dir, platform)
+    # 3. Package archives (independent; zlib releases the GIL while compressing)
+    if "windows" in platform:
+        create, suffix = _create_zip, "zip"
+    else:
+        create, suffix = _create_tar_gz, "tar.gz"
+    kinds = ("full", "app", "runtime")
+    with ThreadPoolExecutor(max_workers=len(kinds)) as ex:
+        futures = [
+            ex.submit(package, kind, files, output_dir, platform, create, suffix)
+            for kind in kinds
+        ]
+        outputs = [fut.result() for fut in futures]
+    # Report from the main thread so the lines never interleave.
+    for kind, out in zip(kinds, outputs):
+        label = kind.capitalize() + ":"
+        print(f"  {label:<9}{out.name} ({_human_size(out)})", file=sys.stderr)
 
     print("Done.", file=sys.stderr)
 
@@ -0,0 +1,23 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+import pytest
+
+from cursor_gui_patch import codesign, discovery, github_release, update
+
+
+@pytest.fixture(autouse=True)
+def _clear_process_caches():
+    """Process-wide lookup caches must not leak between tests."""
+    discovery._read_product_json_cached.cache_clear()
+    discovery._is_cursor_product_json_cached.cache_clear()
+    discovery._is_wsl.cache_clear()
+    discovery._wsl_gui_candidates_cached.cache_clear()
+    codesign._codesign_bin.cache_clear()
+    codesign._xattr_bin.cache_clear()
+    codesign._find_app_bundle_cached.cache_clear()
+    github_release._shared_session_fetch.cache_clear()
+    update._which_cgp.cache_clear()
+    update._resolved_executable.cache_clear()
+    yield
@@ -6,6 +6,8 @@ import subprocess
 from pathlib import Path
 from unittest import mock
 
+import pytest
+
 from cursor_gui_patch.codesign import (
     _find_app_bundle,
     _parse_security_identities,
@@ -34,164 +36,162 @@ class TestFindAppBundle:
         root.mkdir(parents=True)
         assert _find_app_bundle(root) is None
 
+    def test_repeat_lookup_is_memoized(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        app_root, app_bundle = _make_app_root(tmp_path)
+        assert _find_app_bundle(app_root) == app_bundle
+        exists_mock = mock.MagicMock(return_value=False)
+        monkeypatch.setattr(Path, "exists", exists_mock)
+        assert _find_app_bundle(app_root) == app_bundle
+        exists_mock.assert_not_called()
+
 
 class TestNeedsCodesign:
-    def test_false_on_non_macos(self, tmp_path: Path):
+    def test_false_on_non_macos(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
         app_root, _ = _make_app_root(tmp_path)
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "linux"):
-            assert needs_codesign(app_root, "gui") is False
+        monkeypatch.setattr("cursor_gui_patch.codesign.sys.platform", "linux")
+        assert needs_codesign(app_root, "gui") is False
 
-    def test_false_for_server(self, tmp_path: Path):
+    def test_false_for_server(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
         app_root, _ = _make_app_root(tmp_path)
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "darwin"):
-            assert needs_codesign(app_root, "server") is False
+        monkeypatch.setattr("cursor_gui_patch.codesign.sys.platform", "darwin")
+        assert needs_codesign(app_root, "server") is False
 
-    def test_true_for_gui_app_on_macos(self, tmp_path: Path):
+    def test_true_for_gui_app_on_macos(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
         app_root, _ = _make_app_root(tmp_path)
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "darwin"):
-            assert needs_codesign(app_root, "gui") is True
+        monkeypatch.setattr("cursor_gui_patch.codesign.sys.platform", "darwin")
+        assert needs_codesign(app_root, "gui") is True
+
+
+@pytest.fixture
+def codesign_env(monkeypatch: pytest.MonkeyPatch) -> mock.MagicMock:
+    """macOS with codesign/security/xattr on PATH; returns the subprocess.run mock."""
+    monkeypatch.setattr("cursor_gui_patch.codesign.sys.platform", "darwin")
+    monkeypatch.setattr("cursor_gui_patch.codesign.shutil.which", lambda name: f"/usr/bin/{name}")
+    run_mock = mock.MagicMock(
+        return_value=subprocess.CompletedProcess(args=["codesign"], returncode=0, stdout="", stderr=""),
+    )
+    monkeypatch.setattr("cursor_gui_patch.codesign.subprocess.run", run_mock)
+    return run_mock
 
 
 class TestCodesignApp:
-    def test_skips_on_non_macos(self, tmp_path: Path):
+    def test_skips_on_non_macos(self, tmp_path: Path, codesign_env: mock.MagicMock,
+                                monkeypatch: pytest.MonkeyPatch):
         app_root, _ = _make_app_root(tmp_path)
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "linux"), \
-             mock.patch("cursor_gui_patch.codesign.subprocess.run") as run_mock:
-            res = codesign_app(app_root)
+        monkeypatch.setattr("cursor_gui_patch.codesign.sys.platform", "linux")
+        res = codesign_app(app_root)
         assert res.success is False
         assert res.skipped_reason == "not macOS"
-        run_mock.assert_not_called()
+        codesign_env.assert_not_called()
 
-    def test_missing_codesign_binary(self, tmp_path: Path):
+    def test_missing_codesign_binary(self, tmp_path: Path, codesign_env: mock.MagicMock,
+                                     monkeypatch: pytest.MonkeyPatch):
         app_root, _ = _make_app_root(tmp_path)
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "darwin"), \
-             mock.patch("cursor_gui_patch.codesign.shutil.which", return_value=None):
-            res = codesign_app(app_root)
+        monkeypatch.setattr("cursor_gui_patch.codesign.shutil.which", lambda name: None)
+        res = codesign_app(app_root)
         assert res.needed is True
         assert "not found" in res.error
 
-    def test_no_app_bundle_found(self, tmp_path: Path):
+    def test_no_app_bundle_found(self, tmp_path: Path, codesign_env: mock.MagicMock):
         root = tmp_path / "plain-dir"
         root.mkdir()
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "darwin"), \
-             mock.patch("cursor_gui_patch.codesign.shutil.which", return_value="/usr/bin/codesign"):
-            res = codesign_app(root)
+        res = codesign_app(root)
         assert res.success is False
         assert res.skipped_reason == "no .app bundle found"
 
-    def test_codesign_success(self, tmp_path: Path):
+    def test_codesign_success(self, tmp_path: Path, codesign_env: mock.MagicMock):
         app_root, app_bundle = _make_app_root(tmp_path)
-        proc = subprocess.CompletedProcess(args=["codesign"], returncode=0, stdout="", stderr="")
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "darwin"), \
-             mock.patch("cursor_gui_patch.codesign.shutil.which", return_value="/usr/bin/codesign"), \
-             mock.patch("cursor_gui_patch.codesign.subprocess.run", return_value=proc):
-            res = codesign_app(app_root)
+        res = codesign_app(app_root)
         assert res.needed is True
         assert res.success is True
         assert res.app_path == app_bundle
 
-    def test_codesign_failure(self, tmp_path: Path):
+    def test_codesign_failure(self, tmp_path: Path, codesign_env: mock.MagicMock):
         app_root, _ = _make_app_root(tmp_path)
-        proc = subprocess.CompletedProcess(args=["codesign"], returncode=1, stdout="", stderr="boom")
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "darwin"), \
-             mock.patch("cursor_gui_patch.codesign.shutil.which", return_value="/usr/bin/codesign"), \
-             mock.patch("cursor_gui_patch.codesign.subprocess.run", return_value=proc):
-            res = codesign_app(app_root)
+        codesign_env.return_value = subprocess.CompletedProcess(
+            args=["codesign"], returncode=1, stdout="", stderr="boom",
+        )
+        res = codesign_app(app_root)
         assert res.success is False
         assert res.error == "boom"
 
-    def test_codesign_timeout(self, tmp_path: Path):
+    def test_codesign_timeout(self, tmp_path: Path, codesign_env: mock.MagicMock):
         app_root, _ = _make_app_root(tmp_path)
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "darwin"), \
-             mock.patch("cursor_gui_patch.codesign.shutil.which", return_value="/usr/bin/codesign"), \
-             mock.patch(
-                 "cursor_gui_patch.codesign.subprocess.run",
-                 side_effect=subprocess.TimeoutExpired(cmd="codesign", timeout=120),
-             ):
-            res = codesign_app(app_root)
+        codesign_env.side_effect = subprocess.TimeoutExpired(cmd="codesign", timeout=120)
+        res = codesign_app(app_root)
         assert res.success is False
         assert "timed out" in res.error
 
-    def test_uses_explicit_identity_from_env(self, tmp_path: Path):
+    def test_uses_explicit_identity_from_env(self, tmp_path: Path, codesign_env: mock.MagicMock,
+                                             monkeypatch: pytest.MonkeyPatch):
         app_root, _ = _make_app_root(tmp_path)
-        proc = subprocess.CompletedProcess(args=["codesign"], returncode=0, stdout="", stderr="")
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "darwin"), \
-             mock.patch("cursor_gui_patch.codesign.shutil.which", return_value="/usr/bin/codesign"), \
-             mock.patch.dict("cursor_gui_patch.codesign.os.environ", {"CGP_CODESIGN_IDENTITY": "My Stable ID"}, clear=False), \
-             mock.patch("cursor_gui_patch.codesign.subprocess.run", return_value=proc) as run_mock:
-            res = codesign_app(app_root)
+        monkeypatch.setenv("CGP_CODESIGN_IDENTITY", "My Stable ID")
+        res = codesign_app(app_root)
         assert res.success is True
         assert res.identity_used == "My Stable ID"
-        cmd = run_mock.call_args_list[0].args[0]
+        cmd = codesign_env.call_args_list[0].args[0]
         assert "--sign" in cmd
         assert "My Stable ID" in cmd
 
-    def test_falls_back_to_adhoc_when_preferred_identity_fails(self, tmp_path: Path):
+    def test_falls_back_to_adhoc_when_preferred_identity_fails(self, tmp_path: Path,
+                                                               codesign_env: mock.MagicMock):
         app_root, _ = _make_app_root(tmp_path)
-        fail_proc = subprocess.CompletedProcess(args=["codesign"], returncode=1, stdout="", stderr="bad id")
-        ok_proc = subprocess.CompletedProcess(args=["codesign"], returncode=0, stdout="", stderr="")
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "darwin"), \
-             mock.patch("cursor_gui_patch.codesign.shutil.which", side_effect=lambda n: f"/usr/bin/{n}"), \
-             mock.patch("cursor_gui_patch.codesign.subprocess.run", side_effect=[
-                 # security find-identity
-                 subprocess.CompletedProcess(
-                     args=["security"], returncode=0, stdout='  1) HASH "CGP Cursor Patch"\n', stderr=""
-                 ),
-                 # preferred identity fails
-                 fail_proc,
-                 # ad-hoc fallback succeeds
-                 ok_proc,
-             ]):
-            res = codesign_app(app_root)
+        codesign_env.side_effect = [
+            # security find-identity
+            subprocess.CompletedProcess(
+                args=["security"], returncode=0, stdout='  1) HASH "CGP Cursor Patch"\n', stderr=""
+            ),
+            # preferred identity fails
+            subprocess.CompletedProcess(args=["codesign"], returncode=1, stdout="", stderr="bad id"),
+            # ad-hoc fallback succeeds
+            subprocess.CompletedProcess(args=["codesign"], returncode=0, stdout="", stderr=""),
+        ]
+        res = codesign_app(app_root)
         assert res.success is True
         assert res.identity_requested == "CGP Cursor Patch"
         assert res.identity_used == "-"
         assert "fell back to ad-hoc" in res.warning
 
-    def test_auto_uses_stable_identity_when_detected(self, tmp_path: Path):
+    def test_auto_uses_stable_identity_when_detected(self, tmp_path: Path, codesign_env: mock.MagicMock):
         app_root, _ = _make_app_root(tmp_path)
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "darwin"), \
-             mock.patch("cursor_gui_patch.codesign.shutil.which", side_effect=lambda n: f"/usr/bin/{n}"), \
-             mock.patch("cursor_gui_patch.codesign.subprocess.run", side_effect=[
-                 subprocess.CompletedProcess(
-                     args=["security"], returncode=0, stdout='  1) HASH "CGP Cursor Patch"\n', stderr=""
-                 ),
-                 subprocess.CompletedProcess(args=["codesign"], returncode=0, stdout="", stderr=""),
-             ]) as run_mock:
-            res = codesign_app(app_root)
+        codesign_env.side_effect = [
+            subprocess.CompletedProcess(
+                args=["security"], returncode=0, stdout='  1) HASH "CGP Cursor Patch"\n', stderr=""
+            ),
+            subprocess.CompletedProcess(args=["codesign"], returncode=0, stdout="", stderr=""),
+        ]
+        res = codesign_app(app_root)
         assert res.success is True
         assert res.identity_requested == "CGP Cursor Patch"
         assert res.identity_used == "CGP Cursor Patch"
-        cmd = run_mock.call_args_list[1].args[0]
+        cmd = codesign_env.call_args_list[1].args[0]
         assert "--sign" in cmd
         assert "CGP Cursor Patch" in cmd
 
 
 class TestRemoveQuarantine:
-    def test_false_on_non_macos(self, tmp_path: Path):
+    def test_false_on_non_macos(self, tmp_path: Path, codesign_env: mock.MagicMock,
+                                monkeypatch: pytest.MonkeyPatch):
         app_root, _ = _make_app_root(tmp_path)
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "linux"):
-            assert remove_quarantine(app_root) is False
+        monkeypatch.setattr("cursor_gui_patch.codesign.sys.platform", "linux")
+        assert remove_quarantine(app_root) is False
+        codesign_env.assert_not_called()
 
-    def test_false_when_xattr_missing(self, tmp_path: Path):
+    def test_false_when_xattr_missing(self, tmp_path: Path, codesign_env: mock.MagicMock,
+                                      monkeypatch: pytest.MonkeyPatch):
         app_root, _ = _make_app_root(tmp_path)
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "darwin"), \
-             mock.patch("cursor_gui_patch.codesign.shutil.which", return_value=None):
-            assert remove_quarantine(app_root) is False
+        monkeypatch.setattr("cursor_gui_patch.codesign.shutil.which", lambda name: None)
+        assert remove_quarantine(app_root) is False
 
-    def test_true_when_xattr_runs(self, tmp_path: Path):
-        app_root, _ = _make_app_root(tmp_path)
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "darwin"), \
-             mock.patch("cursor_gui_patch.codesign.shutil.which", return_value="/usr/bin/xattr"), \
-             mock.patch("cursor_gui_patch.codesign.subprocess.run", return_value=None):
-            assert remove_quarantine(app_root) is True
+    def test_true_when_xattr_runs(self, tmp_path: Path, codesign_env: mock.MagicMock):
+        app_root, app_bundle = _make_app_root(tmp_path)
+        assert remove_quarantine(app_root) is True
+        assert codesign_env.call_args.args[0] == ["/usr/bin/xattr", "-cr", str(app_bundle)]
 
-    def test_false_when_xattr_raises(self, tmp_path: Path):
+    def test_false_when_xattr_raises(self, tmp_path: Path, codesign_env: mock.MagicMock):
         app_root, _ = _make_app_root(tmp_path)
-        with mock.patch("cursor_gui_patch.codesign.sys.platform", "darwin"), \
-             mock.patch("cursor_gui_patch.codesign.shutil.which", return_value="/usr/bin/xattr"), \
-            mock.patch("cursor_gui_patch.codesign.subprocess.run", side_effect=RuntimeError("xattr failed")):
-            assert remove_quarantine(app_root) is False
+        codesign_env.side_effect = RuntimeError("xattr failed")
+        assert remove_quarantine(app_root) is False
 
 
 class TestIdentityHelpers:
@@ -199,22 +199,19 @@ class TestIdentityHelpers:
         out = '  1) ABC "CGP Cursor Patch"\n  2) DEF "Apple Development: X"\n'
         assert _parse_security_identities(out) == ["CGP Cursor Patch", "Apple Development: X"]
 
-    def test_resolve_prefers_env(self):
-        with mock.patch.dict("cursor_gui_patch.codesign.os.environ", {"CGP_CODESIGN_IDENTITY": "Pinned ID"}, clear=False):
-            ident, source = _resolve_preferred_identity()
+    def test_resolve_prefers_env(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("CGP_CODESIGN_IDENTITY", "Pinned ID")
+        ident, source = _resolve_preferred_identity()
         assert ident == "Pinned ID"
         assert source == "env:CGP_CODESIGN_IDENTITY"
 
-    def test_resolve_uses_stable_identity_name(self):
-        with mock.patch.dict(
-            "cursor_gui_patch.codesign.os.environ",
-            {"CGP_CODESIGN_STABLE_IDENTITY_NAME": "My Stable"},
-            clear=False,
-        ), \
-             mock.patch(
-                 "cursor_gui_patch.codesign._available_codesign_identities",
-                 return_value=["Apple Dev", "My Stable Identity"],
-             ):
-            ident, source = _resolve_preferred_identity()
+    def test_resolve_uses_stable_identity_name(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.delenv("CGP_CODESIGN_IDENTITY", raising=False)
+        monkeypatch.setenv("CGP_CODESIGN_STABLE_IDENTITY_NAME", "My Stable")
+        monkeypatch.setattr(
+            "cursor_gui_patch.codesign._available_codesign_identities",
+            lambda: ["Apple Dev", "My Stable Identity"],
+        )
+        ident, source = _resolve_preferred_identity()
         assert ident == "My Stable Identity"
         assert source == "auto:stable-identity"
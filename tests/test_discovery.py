@@ -4,12 +4,12 @@ from __future__ import annotations
 
 import json
 import os
-import tempfile
-import unittest
 from pathlib import Path
 from typing import List, Optional
 from unittest import mock
 
+import pytest
+
 from cursor_gui_patch.discovery import (
     CursorInstallation,
     EXTENSION_TARGETS,
@@ -28,14 +28,17 @@ from cursor_gui_patch.discovery import (
 )
 
 
+_FAKE_PRODUCT_JSON = json.dumps({
+    "applicationName": "cursor",
+    "serverDataFolderName": ".cursor-server",
+}).encode("utf-8")
+_PLACEHOLDER_JS = b"// placeholder JS content"
+
+
 def _make_fake_installation(root: Path, extensions: Optional[List[str]] = None) -> None:
     """Create a minimal fake Cursor installation directory."""
     root.mkdir(parents=True, exist_ok=True)
-    product_json = root / "product.json"
-    product_json.write_text(json.dumps({
-        "applicationName": "cursor",
-        "serverDataFolderName": ".cursor-server",
-    }))
+    (root / "product.json").write_bytes(_FAKE_PRODUCT_JSON)
     if extensions is None:
         extensions = list(EXTENSION_TARGETS.keys())
     ext_dir = root / "extensions"
@@ -44,138 +47,132 @@ def _make_fake_installation(root: Path, extensions: Optional[List[str]] = None)
         if info:
             target_file = ext_dir / ext / str(info["file"])
             target_file.parent.mkdir(parents=True, exist_ok=True)
-            target_file.write_text("// placeholder JS content")
-
-
-class TestIsCursorAppRoot(unittest.TestCase):
-    def test_valid_root(self):
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            _make_fake_installation(root)
-            self.assertTrue(_is_cursor_app_root(root))
-
-    def test_missing_product_json(self):
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            self.assertFalse(_is_cursor_app_root(root))
-
-    def test_wrong_application_name(self):
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            (root / "product.json").write_text(json.dumps({
-                "applicationName": "vscode",
-            }))
-            self.assertFalse(_is_cursor_app_root(root))
-
-    def test_malformed_json(self):
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            (root / "product.json").write_text("not json")
-            self.assertFalse(_is_cursor_app_root(root))
-
-
-class TestCursorInstallation(unittest.TestCase):
-    def test_target_files(self):
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            _make_fake_installation(root)
-            inst = CursorInstallation(kind="server", root=root, version_id="test123")
-            targets = inst.target_files()
-            self.assertEqual(len(targets), len(EXTENSION_TARGETS))
-            names = {t.extension for t in targets}
-            self.assertEqual(names, set(EXTENSION_TARGETS.keys()))
-
-    def test_target_files_partial(self):
+            target_file.write_bytes(_PLACEHOLDER_JS)
+
+
+@pytest.fixture(scope="session")
+def fake_install(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A full fake installation shared by tests that only read it."""
+    root = tmp_path_factory.mktemp("fake-install")
+    _make_fake_installation(root)
+    return root
+
+
+class TestIsCursorAppRoot:
+    def test_valid_root(self, fake_install: Path):
+        assert _is_cursor_app_root(fake_install)
+
+    def test_missing_product_json(self, tmp_path: Path):
+        assert not _is_cursor_app_root(tmp_path)
+
+    def test_wrong_application_name(self, tmp_path: Path):
+        (tmp_path / "product.json").write_text(json.dumps({
+            "applicationName": "vscode",
+        }))
+        assert not _is_cursor_app_root(tmp_path)
+
+    def test_malformed_json(self, tmp_path: Path):
+        (tmp_path / "product.json").write_text("not json")
+        assert not _is_cursor_app_root(tmp_path)
+
+    def test_non_object_json(self, tmp_path: Path):
+        (tmp_path / "product.json").write_text("[1, 2]")
+        assert not _is_cursor_app_root(tmp_path)
+
+    def test_large_product_json_accepted_from_head(self, tmp_path: Path):
+        data = {"nameShort": "Cursor", "applicationName": "cursor", "padding": "x" * 100_000}
+        (tmp_path / "product.json").write_text(json.dumps(data))
+        with mock.patch("cursor_gui_patch.discovery._read_product_json_cached") as parse_mock:
+            assert _is_cursor_app_root(tmp_path)
+        parse_mock.assert_not_called()
+
+    def test_application_name_past_head_is_found_by_full_parse(self, tmp_path: Path):
+        data = {"padding": "x" * 10_000, "applicationName": "cursor"}
+        (tmp_path / "product.json").write_text(json.dumps(data))
+        assert _is_cursor_app_root(tmp_path)
+
+    def test_rewritten_product_json_is_reparsed(self, tmp_path: Path):
+        _make_fake_installation(tmp_path)
+        assert _is_cursor_app_root(tmp_path)
+        (tmp_path / "product.json").write_text(json.dumps({"applicationName": "code"}))
+        assert not _is_cursor_app_root(tmp_path)
+
+
+class TestCursorInstallation:
+    def test_target_files(self, fake_install: Path):
+        inst = CursorInstallation(kind="server", root=fake_install, version_id="test123")
+        targets = inst.target_files()
+        assert len(targets) == len(EXTENSION_TARGETS)
+        assert {t.extension for t in targets} == set(EXTENSION_TARGETS.keys())
+
+    def test_target_files_partial(self, tmp_path: Path):
         """Only some extensions present."""
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            _make_fake_installation(root, extensions=["cursor-agent-exec"])
-            inst = CursorInstallation(kind="server", root=root, version_id="test123")
-            targets = inst.target_files()
-            self.assertEqual(len(targets), 1)
-            self.assertEqual(targets[0].extension, "cursor-agent-exec")
-            self.assertEqual(targets[0].patch_names, ["autorun"])
-
-
-class TestDiscoverServer(unittest.TestCase):
-    def test_explicit_dir(self):
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            _make_fake_installation(root)
-            results = discover_server_installations(explicit_dir=str(root))
-            self.assertEqual(len(results), 1)
-            self.assertEqual(results[0].kind, "server")
-            self.assertEqual(results[0].root, root)
-
-    def test_explicit_dir_invalid(self):
-        with tempfile.TemporaryDirectory() as d:
-            results = discover_server_installations(explicit_dir=d)
-            self.assertEqual(len(results), 0)
-
-    def test_env_var_override(self):
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            _make_fake_installation(root)
-            old = os.environ.get("CGP_CURSOR_SERVER_DIR")
-            try:
-                os.environ["CGP_CURSOR_SERVER_DIR"] = str(root)
-                results = discover_server_installations()
-                self.assertEqual(len(results), 1)
-            finally:
-                if old is None:
-                    os.environ.pop("CGP_CURSOR_SERVER_DIR", None)
-                else:
-                    os.environ["CGP_CURSOR_SERVER_DIR"] = old
-
-
-class TestDiscoverGui(unittest.TestCase):
-    def test_explicit_dir(self):
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            _make_fake_installation(root)
-            results = discover_gui_installations(explicit_dir=str(root))
-            self.assertEqual(len(results), 1)
-            self.assertEqual(results[0].kind, "gui")
-
-    def test_explicit_dir_invalid(self):
-        with tempfile.TemporaryDirectory() as d:
-            results = discover_gui_installations(explicit_dir=d)
-            self.assertEqual(len(results), 0)
-
-
-# ── New tests (pytest-style) ────────────────────────────────────
+        _make_fake_installation(tmp_path, extensions=["cursor-agent-exec"])
+        inst = CursorInstallation(kind="server", root=tmp_path, version_id="test123")
+        targets = inst.target_files()
+        assert len(targets) == 1
+        assert targets[0].extension == "cursor-agent-exec"
+        assert targets[0].patch_names == ["autorun"]
+
+
+class TestDiscoverServer:
+    def test_explicit_dir(self, fake_install: Path):
+        results = discover_server_installations(explicit_dir=str(fake_install))
+        assert len(results) == 1
+        assert results[0].kind == "server"
+        assert results[0].root == fake_install
+
+    def test_explicit_dir_invalid(self, tmp_path: Path):
+        results = discover_server_installations(explicit_dir=str(tmp_path))
+        assert len(results) == 0
+
+    def test_env_var_override(self, fake_install: Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("CGP_CURSOR_SERVER_DIR", str(fake_install))
+        results = discover_server_installations()
+        assert len(results) == 1
+
+
+class TestDiscoverGui:
+    def test_explicit_dir(self, fake_install: Path):
+        results = discover_gui_installations(explicit_dir=str(fake_install))
+        assert len(results) == 1
+        assert results[0].kind == "gui"
+
+    def test_explicit_dir_invalid(self, tmp_path: Path):
+        results = discover_gui_installations(explicit_dir=str(tmp_path))
+        assert len(results) == 0
 
 
 class TestIsWsl:
     @mock.patch("cursor_gui_patch.discovery.Path")
     def test_detects_microsoft_in_proc_version(self, MockPath):
-        MockPath.return_value.read_text.return_value = (
-            "Linux version 5.15.90.1-microsoft-standard-WSL2"
+        MockPath.return_value.read_bytes.return_value = (
+            b"Linux version 5.15.90.1-microsoft-standard-WSL2"
         )
         assert _is_wsl() is True
 
     @mock.patch("cursor_gui_patch.discovery.Path")
     def test_detects_wsl_keyword(self, MockPath):
-        MockPath.return_value.read_text.return_value = (
-            "Linux version 5.15.90.1-WSL2-custom"
+        MockPath.return_value.read_bytes.return_value = (
+            b"Linux version 5.15.90.1-WSL2-custom"
         )
         assert _is_wsl() is True
 
     @mock.patch("cursor_gui_patch.discovery.Path")
     def test_returns_false_for_native_linux(self, MockPath):
-        MockPath.return_value.read_text.return_value = (
-            "Linux version 6.5.0-44-generic (buildd@bos03-amd64-075)"
+        MockPath.return_value.read_bytes.return_value = (
+            b"Linux version 6.5.0-44-generic (buildd@bos03-amd64-075)"
         )
         assert _is_wsl() is False
 
     @mock.patch("cursor_gui_patch.discovery.Path")
     def test_returns_false_on_read_error(self, MockPath):
-        MockPath.return_value.read_text.side_effect = FileNotFoundError
+        MockPath.return_value.read_bytes.side_effect = FileNotFoundError
         assert _is_wsl() is False
 
     @mock.patch("cursor_gui_patch.discovery.Path")
     def test_returns_false_on_permission_error(self, MockPath):
-        MockPath.return_value.read_text.side_effect = PermissionError
+        MockPath.return_value.read_bytes.side_effect = PermissionError
         assert _is_wsl() is False
 
 
@@ -340,6 +337,30 @@ class TestDiscoverServerAutoDiscover:
         ids = {r.version_id for r in results}
         assert ids == {"aaa111", "bbb222"}
 
+    def test_finds_many_versions_in_parallel(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        bin_dir = tmp_path / ".cursor-server" / "bin"
+        version_ids = [f"v{i:03d}" for i in range(50)]
+        for vid in version_ids:
+            _make_fake_installation(bin_dir / vid, extensions=[])
+        (bin_dir / "stray-file").write_text("")
+        monkeypatch.setattr("cursor_gui_patch.discovery._DISCOVERY_WORKERS", 4)
+
+        with mock.patch("pathlib.Path.home", return_value=tmp_path):
+            results = discover_server_installations()
+
+        assert [r.version_id for r in results] == version_ids
+
+    def test_new_version_is_seen_after_bin_dir_changes(self, tmp_path: Path):
+        bin_dir = tmp_path / ".cursor-server" / "bin"
+        _make_fake_installation(bin_dir / "old", extensions=[])
+
+        with mock.patch("pathlib.Path.home", return_value=tmp_path):
+            assert [r.version_id for r in discover_server_installations()] == ["old"]
+            _make_fake_installation(bin_dir / "new", extensions=[])
+            results = discover_server_installations()
+
+        assert [r.version_id for r in results] == ["new", "old"]
+
     def test_empty_when_no_cursor_server_dir(self, tmp_path: Path):
         with mock.patch("pathlib.Path.home", return_value=tmp_path):
             results = discover_server_installations()
@@ -362,7 +383,7 @@ class TestDiscoverServerAutoDiscover:
         bin_dir.mkdir(parents=True)
 
         with mock.patch("pathlib.Path.home", return_value=tmp_path), \
-             mock.patch.object(Path, "iterdir", side_effect=PermissionError):
+             mock.patch("cursor_gui_patch.discovery.os.scandir", side_effect=PermissionError):
             results = discover_server_installations()
 
         assert len(results) == 0
@@ -444,7 +465,3 @@ class TestDiscoverAll:
             gui_dir=str(tmp_path / "no-gui"),
         )
         assert len(results) == 0
-
-
-if __name__ == "__main__":
-    unittest.main()
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-import json
-import os
+import functools
+import gzip
+import hashlib
+import ssl
 import sys
 import tarfile
 import io
@@ -14,8 +16,10 @@ from unittest import mock
 
 import pytest
 
+from cursor_gui_patch import github_release
 from cursor_gui_patch.github_release import (
     ReleaseInfo,
+    _default_fetch,
     _normalize_arch,
     _parse_version_tuple,
     build_checksums_download_url,
@@ -25,11 +29,13 @@ from cursor_gui_patch.github_release import (
     fetch_latest_release,
     is_frozen_binary,
     is_version_newer,
+    make_session_fetch,
     parse_checksums_txt,
     read_runtime_version_from,
     select_app_asset_name,
     select_release_asset_name,
     select_runtime_asset_name,
+    sha256_file,
     split_repo,
 )
 
@@ -147,7 +153,7 @@ class TestSelectRuntimeAssetName:
 
 class TestFetchLatestRelease:
     def test_success(self):
-        body = json.dumps({"tag_name": "v0.2.0"}).encode()
+        body = b'{"tag_name": "v0.2.0"}'
 
         def fake_fetch(url, timeout_s, headers):
             return body
@@ -157,7 +163,7 @@ class TestFetchLatestRelease:
         assert rel.version == "0.2.0"
 
     def test_missing_tag(self):
-        body = json.dumps({"other": "data"}).encode()
+        body = b'{"other": "data"}'
 
         def fake_fetch(url, timeout_s, headers):
             return body
@@ -166,6 +172,57 @@ class TestFetchLatestRelease:
             fetch_latest_release("owner/repo", fetch=fake_fetch)
 
 
+class TestMakeSessionFetch:
+    def _resp(self, data: bytes) -> mock.MagicMock:
+        resp = mock.MagicMock()
+        resp.__enter__.return_value.read.return_value = data
+        return resp
+
+    def test_reuses_ssl_context(self):
+        fetch = make_session_fetch()
+        with mock.patch(
+            "cursor_gui_patch.github_release.urllib.request.urlopen",
+            side_effect=[self._resp(b"a"), self._resp(b"b")],
+        ) as urlopen:
+            assert fetch("https://example.invalid/a", 1.0, {}) == b"a"
+            assert fetch("https://example.invalid/b", 1.0, {}) == b"b"
+
+        ctx1 = urlopen.call_args_list[0].kwargs["context"]
+        ctx2 = urlopen.call_args_list[1].kwargs["context"]
+        assert ctx1 is ctx2
+
+    def test_sticks_to_bundled_cafile_after_cert_error(self):
+        fetch = make_session_fetch()
+        cert_err = ssl.SSLCertVerificationError("CERTIFICATE_VERIFY_FAILED")
+        bundled_ctx = mock.Mock()
+        with mock.patch(
+            "cursor_gui_patch.github_release.urllib.request.urlopen",
+            side_effect=[cert_err, self._resp(b"a"), self._resp(b"b")],
+        ) as urlopen, \
+             mock.patch("cursor_gui_patch.github_release._bundled_cafile", return_value="/ca.pem"), \
+             mock.patch(
+                 "cursor_gui_patch.github_release.ssl.create_default_context",
+                 side_effect=[mock.Mock(), bundled_ctx],
+             ):
+            assert fetch("https://example.invalid/a", 1.0, {}) == b"a"
+            assert fetch("https://example.invalid/b", 1.0, {}) == b"b"
+
+        assert urlopen.call_count == 3
+        assert urlopen.call_args_list[2].kwargs["context"] is bundled_ctx
+
+    def test_default_fetch_uses_shared_session(self):
+        with mock.patch(
+            "cursor_gui_patch.github_release.urllib.request.urlopen",
+            side_effect=[self._resp(b"a"), self._resp(b"b")],
+        ) as urlopen:
+            assert _default_fetch("https://example.invalid/a", 1.0, {}) == b"a"
+            assert _default_fetch("https://example.invalid/b", 1.0, {}) == b"b"
+
+        ctx1 = urlopen.call_args_list[0].kwargs["context"]
+        ctx2 = urlopen.call_args_list[1].kwargs["context"]
+        assert ctx1 is ctx2
+
+
 class TestParseChecksums:
     def test_normal(self):
         h1 = "a" * 64
@@ -182,6 +239,21 @@ class TestParseChecksums:
         assert parse_checksums_txt("# comment\n") == {}
 
 
+class TestSha256File:
+    def test_matches_hashlib(self, tmp_path: Path):
+        data = bytes(range(256)) * 5000  # spans more than one 1 MiB read
+        p = tmp_path / "blob"
+        p.write_bytes(data)
+        assert sha256_file(p) == hashlib.sha256(data).hexdigest()
+
+    def test_fallback_without_file_digest(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        data = bytes(range(256)) * 5000
+        p = tmp_path / "blob"
+        p.write_bytes(data)
+        monkeypatch.delattr(hashlib, "file_digest", raising=False)
+        assert sha256_file(p) == hashlib.sha256(data).hexdigest()
+
+
 class TestBuildUrls:
     def test_download(self):
         url = build_release_download_url("owner/repo", tag="v1.0", asset_name="a.tar.gz")
@@ -201,26 +273,32 @@ class TestIsFrozenBinary:
             assert is_frozen_binary() is True
 
 
-class TestDownloadAndInstallBundle:
-    def _make_tar_gz(self, exe_name: str = "cgp") -> bytes:
-        buf = io.BytesIO()
-        with tarfile.open(fileobj=buf, mode="w:gz") as tf:
-            content = b"#!/bin/sh\necho ok"
-            info = tarfile.TarInfo(name=f"cgp/{exe_name}")
-            info.size = len(content)
-            info.mode = 0o755
-            tf.addfile(info, io.BytesIO(content))
-        return buf.getvalue()
-
-    def _make_zip(self, exe_name: str = "cgp.exe") -> bytes:
-        buf = io.BytesIO()
-        with zipfile.ZipFile(buf, "w") as zf:
-            zf.writestr(f"cgp/{exe_name}", "fake exe")
-        return buf.getvalue()
+@functools.lru_cache(maxsize=None)
+def _tar_gz_bundle(exe_name: str = "cgp", content: bytes = b"#!/bin/sh\necho ok") -> bytes:
+    """A minimal release tarball; built once per session (bytes are immutable)."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tf:
+        info = tarfile.TarInfo(name=f"cgp/{exe_name}")
+        info.size = len(content)
+        info.mode = 0o755
+        tf.addfile(info, io.BytesIO(content))
+    # mtime=0 keeps the gzip header, and so the fixture bytes, identical across runs.
+    return gzip.compress(buf.getvalue(), compresslevel=1, mtime=0)
+
+
+@functools.lru_cache(maxsize=None)
+def _zip_bundle(exe_name: str = "cgp.exe") -> bytes:
+    """A minimal Windows release zip; built once per session."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr(f"cgp/{exe_name}", "fake exe")
+    return buf.getvalue()
 
+
+class TestDownloadAndInstallBundle:
     @pytest.mark.skipif(sys.platform == "win32", reason="symlinks require elevated privileges on Windows")
     def test_tar_gz_install(self, tmp_path: Path):
-        data = self._make_tar_gz()
+        data = _tar_gz_bundle()
         calls = {}
 
         def fake_fetch(url: str, timeout_s: float, headers: Dict[str, str]) -> bytes:
@@ -246,8 +324,8 @@ class TestDownloadAndInstallBundle:
         assert (install_root / "current").is_symlink()
         assert (bin_dir / "cgp").is_symlink()
 
-    def test_zip_install(self, tmp_path: Path):
-        data = self._make_zip()
+    def test_zip_install(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        data = _zip_bundle()
 
         def fake_fetch(url: str, timeout_s: float, headers: Dict[str, str]) -> bytes:
             if "checksums.txt" in url:
@@ -257,18 +335,17 @@ class TestDownloadAndInstallBundle:
         install_root = tmp_path / "root"
         bin_dir = tmp_path / "bin"
 
-        with mock.patch("cursor_gui_patch.github_release.sys") as mock_sys:
-            mock_sys.platform = "win32"
-            mock_sys.executable = str(tmp_path / "cgp.exe")
-            result = download_and_install_release_bundle(
-                repo="owner/repo",
-                tag="v0.1.0",
-                asset_name="cgp-windows-x86_64.zip",
-                install_root=install_root,
-                bin_dir=bin_dir,
-                fetch=fake_fetch,
-                verify_checksums=False,
-            )
+        monkeypatch.setattr(github_release.sys, "platform", "win32")
+        monkeypatch.setattr(github_release.sys, "executable", str(tmp_path / "cgp.exe"))
+        result = download_and_install_release_bundle(
+            repo="owner/repo",
+            tag="v0.1.0",
+            asset_name="cgp-windows-x86_64.zip",
+            install_root=install_root,
+            bin_dir=bin_dir,
+            fetch=fake_fetch,
+            verify_checksums=False,
+        )
 
         assert (install_root / "versions" / "v0.1.0" / "cgp").exists()
 
@@ -284,7 +361,7 @@ class TestDownloadAndInstallBundle:
             )
 
     def test_checksum_fetch_failure_fails_closed(self, tmp_path: Path):
-        data = self._make_tar_gz()
+        data = _tar_gz_bundle()
 
         def fake_fetch(url: str, timeout_s: float, headers: Dict[str, str]) -> bytes:
             if "checksums.txt" in url:
@@ -302,30 +379,31 @@ class TestDownloadAndInstallBundle:
                 verify_checksums=True,
             )
 
-    def test_checksum_fetch_failure_allowed_with_env_override(self, tmp_path: Path):
-        data = self._make_tar_gz()
+    def test_checksum_fetch_failure_allowed_with_env_override(self, tmp_path: Path,
+                                                              monkeypatch: pytest.MonkeyPatch):
+        data = _tar_gz_bundle()
 
         def fake_fetch(url: str, timeout_s: float, headers: Dict[str, str]) -> bytes:
             if "checksums.txt" in url:
                 raise RuntimeError("network down")
             return data
 
-        with mock.patch.dict(os.environ, {"CGP_ALLOW_INSECURE_UPDATE": "1"}, clear=False), \
-             mock.patch("cursor_gui_patch.github_release.sys.platform", "linux"):
-            result = download_and_install_release_bundle(
-                repo="owner/repo",
-                tag="v0.1.0",
-                asset_name="cgp-linux-x86_64.tar.gz",
-                install_root=tmp_path / "root",
-                bin_dir=tmp_path / "bin",
-                fetch=fake_fetch,
-                verify_checksums=True,
-            )
+        monkeypatch.setenv("CGP_ALLOW_INSECURE_UPDATE", "1")
+        monkeypatch.setattr("cursor_gui_patch.github_release.sys.platform", "linux")
+        result = download_and_install_release_bundle(
+            repo="owner/repo",
+            tag="v0.1.0",
+            asset_name="cgp-linux-x86_64.tar.gz",
+            install_root=tmp_path / "root",
+            bin_dir=tmp_path / "bin",
+            fetch=fake_fetch,
+            verify_checksums=True,
+        )
 
         assert result.exists()
 
     def test_checksum_missing_asset_entry_fails(self, tmp_path: Path):
-        data = self._make_tar_gz()
+        data = _tar_gz_bundle()
 
         def fake_fetch(url: str, timeout_s: float, headers: Dict[str, str]) -> bytes:
             if "checksums.txt" in url:
@@ -344,7 +422,7 @@ class TestDownloadAndInstallBundle:
             )
 
     def test_checksum_mismatch_fails(self, tmp_path: Path):
-        data = self._make_tar_gz()
+        data = _tar_gz_bundle()
 
         def fake_fetch(url: str, timeout_s: float, headers: Dict[str, str]) -> bytes:
             if "checksums.txt" in url:
@@ -380,16 +458,6 @@ class TestRuntimeVersion:
 
 
 class TestDownloadAndInstallAppOnly:
-    def _make_app_tar_gz(self, exe_name: str = "cgp") -> bytes:
-        buf = io.BytesIO()
-        with tarfile.open(fileobj=buf, mode="w:gz") as tf:
-            content = b"#!/bin/sh\necho ok v2"
-            info = tarfile.TarInfo(name=f"cgp/{exe_name}")
-            info.size = len(content)
-            info.mode = 0o755
-            tf.addfile(info, io.BytesIO(content))
-        return buf.getvalue()
-
     @pytest.mark.skipif(sys.platform == "win32", reason="symlinks require elevated privileges on Windows")
     def test_app_only_install_with_symlink(self, tmp_path: Path):
         """App-only install should reuse existing _internal/ via symlink."""
@@ -399,7 +467,7 @@ class TestDownloadAndInstallAppOnly:
         (existing_internal / "libpython.so").write_bytes(b"fake lib")
         (existing_internal / "RUNTIME_VERSION").write_text("abc123\n", encoding="utf-8")
 
-        data = self._make_app_tar_gz()
+        data = _tar_gz_bundle(content=b"#!/bin/sh\necho ok v2")
 
         def fake_fetch(url: str, timeout_s: float, headers: Dict[str, str]) -> bytes:
             if "checksums.txt" in url:
@@ -439,7 +507,7 @@ class TestDownloadAndInstallAppOnly:
 
     def test_app_only_missing_internal(self, tmp_path: Path):
         """Should fail if existing _internal/ doesn't exist."""
-        data = self._make_app_tar_gz()
+        data = _tar_gz_bundle(content=b"#!/bin/sh\necho ok v2")
 
         def fake_fetch(url: str, timeout_s: float, headers: Dict[str, str]) -> bytes:
             return data
@@ -24,10 +24,21 @@ SAMPLE_CALLER_2 = (
 
 SAMPLE_FULL = f"prefix;{SAMPLE_METHOD};middle;{SAMPLE_CALLER_1};between;{SAMPLE_CALLER_2};suffix"
 
+# Fragments a patched SAMPLE_FULL must contain: the marked early return and
+# the original method body (unreachable but still present).
+_EXPECTED_AFTER_APPLY = (
+    "async getTeamAdminSettings(){return void 0/* CGP_PATCH_AUTORUN_DISABLED */;",
+    "this.lastFetchTime",
+)
+
 
 class TestAutoRunPatch(unittest.TestCase):
-    def setUp(self):
-        self.patch = AutoRunPatch()
+    @classmethod
+    def setUpClass(cls):
+        # Patches are stateless, so one instance serves every test.
+        cls.patch = AutoRunPatch()
+        # apply() is deterministic; tests that only inspect its output share one run.
+        cls.applied = cls.patch.apply(SAMPLE_FULL)
 
     def test_name(self):
         self.assertEqual(self.patch.name, "autorun")
@@ -46,25 +57,20 @@ class TestAutoRunPatch(unittest.TestCase):
         self.assertFalse(self.patch.is_applicable("getTeamAdminSettings"))
 
     def test_apply_injects_early_return(self):
-        new_content, result = self.patch.apply(SAMPLE_FULL)
+        new_content, result = self.applied
         self.assertTrue(result.applied)
-        self.assertIn("CGP_PATCH_AUTORUN_DISABLED", new_content)
-        self.assertIn(
-            "async getTeamAdminSettings(){return void 0/* CGP_PATCH_AUTORUN_DISABLED */;",
-            new_content,
-        )
-        # Original method body is preserved (unreachable but still present)
-        self.assertIn("this.lastFetchTime", new_content)
+        missing = [frag for frag in _EXPECTED_AFTER_APPLY if frag not in new_content]
+        self.assertEqual(missing, [])
 
     def test_apply_preserves_callers(self):
         """Downstream methods that call getTeamAdminSettings remain untouched."""
-        new_content, result = self.patch.apply(SAMPLE_FULL)
+        new_content, result = self.applied
         self.assertTrue(result.applied)
         self.assertIn("getAutoRunControls", new_content)
         self.assertIn("getShouldBlockMcp", new_content)
 
     def test_apply_replacement_count(self):
-        new_content, result = self.patch.apply(SAMPLE_FULL)
+        new_content, result = self.applied
         # Only the caching layer's method should be patched (1 injection)
         self.assertEqual(result.replacements, 1)
 
@@ -84,6 +90,13 @@ class TestAutoRunPatch(unittest.TestCase):
         self.assertFalse(result.applied)
         self.assertEqual(content, new_content)
 
+    def test_not_applicable_without_method_definition(self):
+        content = "const s=await this.getTeamAdminSettings();"
+        new_content, result = self.patch.apply(content)
+        self.assertTrue(result.not_applicable)
+        self.assertEqual(result.replacements, 0)
+        self.assertEqual(content, new_content)
+
     def test_method_only(self):
         """Test with just the method, no callers."""
         content = f"prefix;{SAMPLE_METHOD};suffix"
@@ -93,7 +106,7 @@ class TestAutoRunPatch(unittest.TestCase):
 
     def test_minimal_change(self):
         """The patch should only add bytes, not remove any."""
-        new_content, result = self.patch.apply(SAMPLE_FULL)
+        new_content, result = self.applied
         self.assertTrue(result.applied)
         self.assertGreater(len(new_content), len(SAMPLE_FULL))
 
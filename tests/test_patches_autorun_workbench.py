@@ -12,8 +12,9 @@ SAMPLE = (
 
 
 class TestAutoRunWorkbenchPatch(unittest.TestCase):
-    def setUp(self):
-        self.patch = AutoRunWorkbenchPatch()
+    @classmethod
+    def setUpClass(cls):
+        cls.patch = AutoRunWorkbenchPatch()
 
     def test_name(self):
         self.assertEqual(self.patch.name, "autorun_workbench")
@@ -39,10 +40,9 @@ class TestAutoRunWorkbenchPatch(unittest.TestCase):
     def test_apply_preserves_surrounding_code(self):
         new_content, result = self.patch.apply(SAMPLE)
         self.assertTrue(result.applied)
-        self.assertIn("prefix;", new_content)
-        self.assertIn(";suffix", new_content)
         # The if(s) branch is still there, just s is always false
-        self.assertIn("if(s){", new_content)
+        missing = [frag for frag in ("prefix;", ";suffix", "if(s){") if frag not in new_content]
+        self.assertEqual(missing, [])
 
     def test_idempotent(self):
         new_content, result1 = self.patch.apply(SAMPLE)
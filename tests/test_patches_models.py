@@ -46,8 +46,9 @@ SAMPLE_RETRIEVAL = (
 
 
 class TestModelsPatch(unittest.TestCase):
-    def setUp(self):
-        self.patch = ModelsPatch()
+    @classmethod
+    def setUpClass(cls):
+        cls.patch = ModelsPatch()
 
     def test_name(self):
         self.assertEqual(self.patch.name, "models")
@@ -111,15 +112,16 @@ class TestModelsPatch(unittest.TestCase):
     def test_preserves_surrounding_code(self):
         """Ensure patch doesn't corrupt surrounding content."""
         new_content, result = self.patch.apply(SAMPLE_FULL)
-        # AgentService method before getUsableModels should still be there
-        self.assertIn('nameAgent:{name:"NameAgent"', new_content)
-        # Methods after should still be there
-        self.assertIn('getDefaultModelForCli:{name:"GetDefaultModelForCli"', new_content)
-        # AiServerService's availableModels should be untouched
-        self.assertIn(
+        surrounding = (
+            # AgentService method before getUsableModels should still be there
+            'nameAgent:{name:"NameAgent"',
+            # Methods after should still be there
+            'getDefaultModelForCli:{name:"GetDefaultModelForCli"',
+            # AiServerService's availableModels should be untouched
             'availableModels:{name:"AvailableModels",I:r.AvailableModelsRequest',
-            new_content,
         )
+        missing = [frag for frag in surrounding if frag not in new_content]
+        self.assertEqual(missing, [])
 
 
 if __name__ == "__main__":
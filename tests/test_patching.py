@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
 import tempfile
@@ -44,14 +45,22 @@ WORKBENCH_CONTENT = (
 # Content with no patchable patterns
 IRRELEVANT_CONTENT = "function foo() { return 42; }"
 
+_PRODUCT_JSON = b'{"applicationName": "cursor", "serverDataFolderName": ".cursor-server"}'
+_PRODUCT_DATA = json.loads(_PRODUCT_JSON)
+_EXT_FILE_RELPATHS = {name: str(info["file"]) for name, info in EXTENSION_TARGETS.items()}
+_WB_FILE_RELPATH = str(WORKBENCH_TARGETS["workbench.desktop.main.js"]["file"])
+
+
+@functools.lru_cache(maxsize=None)
+def _utf8(content: str) -> bytes:
+    """Encoded fixture content; the same few constants are written by every test."""
+    return content.encode("utf-8")
+
 
 def _make_test_installation(root: Path, contents: Optional[Dict[str, str]] = None) -> CursorInstallation:
     """Create a test installation with specified file contents."""
     root.mkdir(parents=True, exist_ok=True)
-    (root / "product.json").write_text(json.dumps({
-        "applicationName": "cursor",
-        "serverDataFolderName": ".cursor-server",
-    }))
+    (root / "product.json").write_bytes(_PRODUCT_JSON)
 
     if contents is None:
         contents = {
@@ -60,10 +69,9 @@ def _make_test_installation(root: Path, contents: Optional[Dict[str, str]] = Non
         }
 
     for ext_name, content in contents.items():
-        info = EXTENSION_TARGETS.get(ext_name, {"file": "dist/main.js"})
-        target = root / "extensions" / ext_name / str(info["file"])
+        target = root / "extensions" / ext_name / _EXT_FILE_RELPATHS.get(ext_name, "dist/main.js")
         target.parent.mkdir(parents=True, exist_ok=True)
-        target.write_text(content)
+        target.write_bytes(_utf8(content))
 
     return CursorInstallation(kind="server", root=root, version_id="test")
 
@@ -81,7 +89,8 @@ class TestPatch(unittest.TestCase):
             inst = _make_test_installation(Path(d))
             patch(installations=[inst])
             for t in inst.target_files():
-                self.assertTrue(has_backup(t.path), f"No backup for {t.path}")
+                with self.subTest(path=t.path):
+                    self.assertTrue(has_backup(t.path), f"No backup for {t.path}")
 
     def test_patch_idempotent(self):
         with tempfile.TemporaryDirectory() as d:
@@ -101,7 +110,8 @@ class TestPatch(unittest.TestCase):
             self.assertEqual(len(report.patched), 2)
             # Files should not be modified
             for t in inst.target_files():
-                self.assertFalse(has_backup(t.path))
+                with self.subTest(path=t.path):
+                    self.assertFalse(has_backup(t.path))
 
     def test_patch_only_autorun(self):
         with tempfile.TemporaryDirectory() as d:
@@ -146,10 +156,9 @@ class TestUnpatch(unittest.TestCase):
     def test_unpatch_restores(self):
         with tempfile.TemporaryDirectory() as d:
             inst = _make_test_installation(Path(d))
+            targets = inst.target_files()
             # Read original content
-            originals = {}
-            for t in inst.target_files():
-                originals[str(t.path)] = t.path.read_text()
+            originals = {t.path: t.path.read_bytes() for t in targets}
 
             # Patch
             patch(installations=[inst])
@@ -160,10 +169,10 @@ class TestUnpatch(unittest.TestCase):
             self.assertGreater(len(report.restored), 0)
 
             # Verify content restored
-            for t in inst.target_files():
-                current = t.path.read_text()
-                original = originals[str(t.path)]
-                self.assertEqual(current, original, f"{t.path} not restored")
+            for t in targets:
+                with self.subTest(path=t.path):
+                    self.assertEqual(t.path.read_bytes(), originals[t.path],
+                                     f"{t.path} not restored")
 
     def test_unpatch_no_backup(self):
         with tempfile.TemporaryDirectory() as d:
@@ -324,18 +333,20 @@ class TestStatus(unittest.TestCase):
                     self.assertTrue(is_patched, f"{f.extension}:{pname} should be patched")
 
 
+@functools.lru_cache(maxsize=None)
+def _sha256_hex(content: str) -> str:
+    """SHA-256 of a fixture string, memoized like _utf8."""
+    return hashlib.sha256(_utf8(content)).hexdigest()
+
+
 def _add_ext_host_with_hashes(root: Path, contents: Dict[str, str]) -> Path:
     """Create extensionHostProcess.js containing SHA-256 hashes of extension files."""
     ext_host = root / _EXT_HOST_RELPATH
     ext_host.parent.mkdir(parents=True, exist_ok=True)
 
     # Build a fake extensionHostProcess.js that embeds hashes of extension files
-    hashes = []
-    for ext_name, content in contents.items():
-        h = hashlib.sha256(content.encode("utf-8")).hexdigest()
-        hashes.append(h)
-    ext_host_content = "var krt={" + ",".join(f'"{h}":true' for h in hashes) + "};"
-    ext_host.write_text(ext_host_content)
+    entries = ",".join([f'"{_sha256_hex(content)}":true' for content in contents.values()])
+    ext_host.write_bytes(f"var krt={{{entries}}};".encode("ascii"))
     return ext_host
 
 
@@ -362,13 +373,14 @@ class TestExtensionHostHashes(unittest.TestCase):
 
             # Old hashes should be gone, new hashes should be present
             for ext_name, content in contents.items():
-                old_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+                old_hash = _sha256_hex(content)
                 self.assertNotIn(old_hash, updated_ext_host)
 
             # New hashes should match the actual patched file contents
-            for t in inst.target_files():
-                new_hash = hashlib.sha256(t.path.read_bytes()).hexdigest()
-                self.assertIn(new_hash, updated_ext_host)
+            digests = {t.path: hashlib.sha256(t.path.read_bytes()).hexdigest()
+                       for t in inst.target_files()}
+            missing = [p for p, h in digests.items() if h not in updated_ext_host]
+            self.assertEqual(missing, [])
 
     def test_patch_creates_ext_host_backup(self):
         """Patching should create a backup of extensionHostProcess.js."""
@@ -424,11 +436,10 @@ class TestExtensionHostHashes(unittest.TestCase):
             inst = _make_test_installation(root)
             ext_host = root / _EXT_HOST_RELPATH
             ext_host.parent.mkdir(parents=True, exist_ok=True)
-            ext_host.write_text("var krt={};")
+            ext_host.write_bytes(b"var krt={};")
 
-            original = ext_host.read_text()
             patch(installations=[inst])
-            self.assertEqual(ext_host.read_text(), original)
+            self.assertEqual(ext_host.read_bytes(), b"var krt={};")
             self.assertFalse(has_backup(ext_host))
 
     def test_ext_host_not_written_when_backup_fails(self):
@@ -467,29 +478,28 @@ class TestExtensionHostHashes(unittest.TestCase):
 
 def _add_workbench_file(root: Path, content: str = WORKBENCH_CONTENT) -> Path:
     """Create workbench.desktop.main.js under the installation root."""
-    info = WORKBENCH_TARGETS["workbench.desktop.main.js"]
-    wb_path = root / str(info["file"])
+    wb_path = root / _WB_FILE_RELPATH
     wb_path.parent.mkdir(parents=True, exist_ok=True)
-    wb_path.write_text(content)
+    wb_path.write_bytes(_utf8(content))
     return wb_path
 
 
+@functools.lru_cache(maxsize=None)
 def _b64sha256(data: bytes) -> str:
     """Compute base64(sha256(data)) without padding — same format as product.json."""
     return base64.b64encode(hashlib.sha256(data).digest()).decode("ascii").rstrip("=")
 
 
 def _add_product_json_with_checksums(root: Path, files: Dict[str, Path]) -> Path:
-    """Rewrite product.json to include a checksums dict.
+    """Rewrite the default product.json to include a checksums dict.
 
     *files* maps relative-to-out/ POSIX paths to their absolute file paths.
     """
     product_json = root / "product.json"
-    data = json.loads(product_json.read_text())
     checksums: Dict[str, str] = {}
     for rel_posix, abs_path in files.items():
         checksums[rel_posix] = _b64sha256(abs_path.read_bytes())
-    data["checksums"] = checksums
+    data = dict(_PRODUCT_DATA, checksums=checksums)
     product_json.write_bytes(
         json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
     )
@@ -499,32 +509,33 @@ def _add_product_json_with_checksums(root: Path, files: Dict[str, Path]) -> Path
 class TestWorkbenchPatch(unittest.TestCase):
     """Integration tests for the autorun_workbench patch via the patching engine."""
 
-    def test_workbench_patch_applies(self):
-        """Workbench file should be patched when present."""
+    def test_workbench_patch_lifecycle(self):
+        """Workbench file is patched once, left alone on re-patch, then restored."""
         with tempfile.TemporaryDirectory() as d:
             root = Path(d)
             inst = _make_test_installation(root)
             wb = _add_workbench_file(root)
+            original = wb.read_text()
 
             report = patch(installations=[inst])
-            self.assertTrue(report.ok)
-            self.assertIn(wb, report.patched)
-
-            content = wb.read_text()
-            # The enabled check should be short-circuited to !1
-            self.assertNotIn("r?.autoRunControls?.enabled", content)
-            self.assertIn("CGP_PATCH_AUTORUN_WORKBENCH", content)
-
-    def test_workbench_patch_idempotent(self):
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            inst = _make_test_installation(root)
-            _add_workbench_file(root)
-
-            patch(installations=[inst])
-            report2 = patch(installations=[inst], force=True)
-            self.assertEqual(len([p for p in report2.patched
-                                  if p.name == "workbench.desktop.main.js"]), 0)
+            with self.subTest(case="applies"):
+                self.assertTrue(report.ok)
+                self.assertIn(wb, report.patched)
+                content = wb.read_text()
+                # The enabled check should be short-circuited to !1
+                self.assertNotIn("r?.autoRunControls?.enabled", content)
+                self.assertIn("CGP_PATCH_AUTORUN_WORKBENCH", content)
+
+            with self.subTest(case="idempotent"):
+                report2 = patch(installations=[inst], force=True)
+                self.assertEqual(len([p for p in report2.patched
+                                      if p.name == "workbench.desktop.main.js"]), 0)
+
+            with self.subTest(case="unpatch restores"):
+                report3 = unpatch(installations=[inst])
+                self.assertTrue(report3.ok)
+                self.assertIn(wb, report3.restored)
+                self.assertEqual(wb.read_text(), original)
 
     def test_workbench_skipped_when_absent(self):
         """Server installs without workbench file should not error."""
@@ -536,111 +547,65 @@ class TestWorkbenchPatch(unittest.TestCase):
             self.assertTrue(report.ok)
             self.assertEqual(len(report.patched), 2)  # only extension files
 
-    def test_unpatch_restores_workbench(self):
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            inst = _make_test_installation(root)
-            wb = _add_workbench_file(root)
-            original = wb.read_text()
-
-            patch(installations=[inst])
-            self.assertNotEqual(wb.read_text(), original)
-
-            report = unpatch(installations=[inst])
-            self.assertTrue(report.ok)
-            self.assertIn(wb, report.restored)
-            self.assertEqual(wb.read_text(), original)
-
 
 class TestProductJsonChecksums(unittest.TestCase):
     """Tests for product.json checksums update."""
 
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = root = Path(tmp.name)
+        contents = {
+            "cursor-agent-exec": AUTORUN_CONTENT,
+            "cursor-always-local": MODELS_CONTENT,
+        }
+        self.inst = _make_test_installation(root, contents)
+        ext_host = _add_ext_host_with_hashes(root, contents)
+        wb = _add_workbench_file(root)
+
+        # Build checksums for ext_host and workbench
+        out_dir = root / "out"
+        self.checksum_files = {
+            ext_host.relative_to(out_dir).as_posix(): ext_host,
+            wb.relative_to(out_dir).as_posix(): wb,
+        }
+        self.product_json = _add_product_json_with_checksums(root, self.checksum_files)
+
     def test_checksums_updated_after_patch(self):
         """After patching, product.json checksums should match the new file contents."""
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            contents = {
-                "cursor-agent-exec": AUTORUN_CONTENT,
-                "cursor-always-local": MODELS_CONTENT,
-            }
-            inst = _make_test_installation(root, contents)
-            ext_host = _add_ext_host_with_hashes(root, contents)
-            wb = _add_workbench_file(root)
+        original_pj = self.product_json.read_bytes()
 
-            # Build checksums for ext_host and workbench
-            out_dir = root / "out"
-            checksum_files = {
-                ext_host.relative_to(out_dir).as_posix(): ext_host,
-                wb.relative_to(out_dir).as_posix(): wb,
-            }
-            product_json = _add_product_json_with_checksums(root, checksum_files)
-            original_pj = product_json.read_bytes()
+        report = patch(installations=[self.inst])
+        self.assertTrue(report.ok)
 
-            report = patch(installations=[inst])
-            self.assertTrue(report.ok)
+        # product.json should have been modified
+        updated_pj = self.product_json.read_bytes()
+        self.assertNotEqual(original_pj, updated_pj)
 
-            # product.json should have been modified
-            updated_pj = product_json.read_bytes()
-            self.assertNotEqual(original_pj, updated_pj)
-
-            # Verify checksums match actual file contents
-            data = json.loads(updated_pj)
-            checksums = data["checksums"]
-            for rel_posix, abs_path in checksum_files.items():
-                expected = _b64sha256(abs_path.read_bytes())
-                self.assertEqual(checksums[rel_posix], expected,
-                                 f"Checksum mismatch for {rel_posix}")
+        # Verify checksums match actual file contents
+        data = json.loads(updated_pj)
+        checksums = data["checksums"]
+        for rel_posix, abs_path in self.checksum_files.items():
+            expected = _b64sha256(abs_path.read_bytes())
+            self.assertEqual(checksums[rel_posix], expected,
+                             f"Checksum mismatch for {rel_posix}")
 
     def test_checksums_backup_created(self):
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            contents = {
-                "cursor-agent-exec": AUTORUN_CONTENT,
-                "cursor-always-local": MODELS_CONTENT,
-            }
-            inst = _make_test_installation(root, contents)
-            _add_ext_host_with_hashes(root, contents)
-            wb = _add_workbench_file(root)
-
-            out_dir = root / "out"
-            ext_host = root / _EXT_HOST_RELPATH
-            _add_product_json_with_checksums(root, {
-                ext_host.relative_to(out_dir).as_posix(): ext_host,
-                wb.relative_to(out_dir).as_posix(): wb,
-            })
-
-            product_json = root / "product.json"
-            patch(installations=[inst])
-            self.assertTrue(has_backup(product_json))
+        patch(installations=[self.inst])
+        self.assertTrue(has_backup(self.product_json))
 
     def test_unpatch_restores_product_json(self):
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            contents = {
-                "cursor-agent-exec": AUTORUN_CONTENT,
-                "cursor-always-local": MODELS_CONTENT,
-            }
-            inst = _make_test_installation(root, contents)
-            ext_host = _add_ext_host_with_hashes(root, contents)
-            wb = _add_workbench_file(root)
+        product_json = self.product_json
+        original_pj = product_json.read_bytes()
 
-            out_dir = root / "out"
-            _add_product_json_with_checksums(root, {
-                ext_host.relative_to(out_dir).as_posix(): ext_host,
-                wb.relative_to(out_dir).as_posix(): wb,
-            })
+        patch(installations=[self.inst])
+        self.assertNotEqual(product_json.read_bytes(), original_pj)
 
-            product_json = root / "product.json"
-            original_pj = product_json.read_bytes()
-
-            patch(installations=[inst])
-            self.assertNotEqual(product_json.read_bytes(), original_pj)
-
-            report = unpatch(installations=[inst])
-            self.assertTrue(report.ok)
-            self.assertIn(product_json, report.restored)
-            self.assertEqual(product_json.read_bytes(), original_pj)
-            self.assertFalse(has_backup(product_json))
+        report = unpatch(installations=[self.inst])
+        self.assertTrue(report.ok)
+        self.assertIn(product_json, report.restored)
+        self.assertEqual(product_json.read_bytes(), original_pj)
+        self.assertFalse(has_backup(product_json))
 
     def test_empty_checksums_skipped(self):
         """Server installs with empty checksums should not modify product.json."""
@@ -655,53 +620,37 @@ class TestProductJsonChecksums(unittest.TestCase):
 
             # Default product.json has no checksums field → treated as empty
             product_json = root / "product.json"
-            original_pj = product_json.read_bytes()
 
             patch(installations=[inst])
             # product.json should not have a backup (no checksums to update)
             self.assertFalse(has_backup(product_json))
 
     def test_product_json_not_written_when_backup_fails(self):
-        with tempfile.TemporaryDirectory() as d:
-            root = Path(d)
-            contents = {
-                "cursor-agent-exec": AUTORUN_CONTENT,
-                "cursor-always-local": MODELS_CONTENT,
-            }
-            inst = _make_test_installation(root, contents)
-            ext_host = _add_ext_host_with_hashes(root, contents)
-            wb = _add_workbench_file(root)
-
-            out_dir = root / "out"
-            _add_product_json_with_checksums(root, {
-                ext_host.relative_to(out_dir).as_posix(): ext_host,
-                wb.relative_to(out_dir).as_posix(): wb,
-            })
-
-            product_json = root / "product.json"
-            original = product_json.read_bytes()
-            originals = {t.path: t.path.read_text() for t in inst.target_files()}
-
-            from cursor_gui_patch import patching as patching_module
-            real_create_backup = patching_module.bak.create_backup_with_error
-
-            def fake_create_backup(path: Path):
-                if path == product_json:
-                    return (None, OSError("[Errno 1] Operation not permitted"))
-                return real_create_backup(path)
-
-            with mock.patch(
-                "cursor_gui_patch.patching.bak.create_backup_with_error",
-                side_effect=fake_create_backup,
-            ):
-                report = patch(installations=[inst], force=True)
-
-            self.assertFalse(report.ok)
-            self.assertEqual(len(report.patched), 0)
-            self.assertEqual(product_json.read_bytes(), original)
-            for p, original_content in originals.items():
-                self.assertEqual(p.read_text(), original_content)
-            self.assertTrue(any(p == product_json and "backup failed" in msg for p, msg in report.errors))
+        inst = self.inst
+        product_json = self.product_json
+        original = product_json.read_bytes()
+        originals = {t.path: t.path.read_text() for t in inst.target_files()}
+
+        from cursor_gui_patch import patching as patching_module
+        real_create_backup = patching_module.bak.create_backup_with_error
+
+        def fake_create_backup(path: Path):
+            if path == product_json:
+                return (None, OSError("[Errno 1] Operation not permitted"))
+            return real_create_backup(path)
+
+        with mock.patch(
+            "cursor_gui_patch.patching.bak.create_backup_with_error",
+            side_effect=fake_create_backup,
+        ):
+            report = patch(installations=[inst], force=True)
+
+        self.assertFalse(report.ok)
+        self.assertEqual(len(report.patched), 0)
+        self.assertEqual(product_json.read_bytes(), original)
+        for p, original_content in originals.items():
+            self.assertEqual(p.read_text(), original_content)
+        self.assertTrue(any(p == product_json and "backup failed" in msg for p, msg in report.errors))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,160 @@
+"""Packaging checks for scripts/post_build.py."""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import os
+import stat
+import sys
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+_SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "post_build.py"
+_spec = importlib.util.spec_from_file_location("post_build", _SCRIPT)
+post_build = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(post_build)
+
+_BIG = bytes(range(256)) * 400  # > 64 KiB, takes the streaming tar path
+
+
+def _make_dist(tmp_path: Path) -> Path:
+    """Build a small PyInstaller-like onedir tree under tmp_path/dist/cgp."""
+    cgp = tmp_path / "dist" / "cgp"
+    internal = cgp / "_internal"
+    (internal / "lib").mkdir(parents=True)
+    (internal / "pkg" / "sub").mkdir(parents=True)
+    (internal / "data").mkdir()
+    (internal / "empty").mkdir()
+
+    exe = cgp / "cgp"
+    exe.write_bytes(b"#!/bin/sh\necho cgp\n")
+    exe.chmod(0o755)
+    (internal / "base_library.zip").write_bytes(b"PK\x05\x06" + b"\0" * 18)
+    (internal / "data" / "big.bin").write_bytes(_BIG)
+    (internal / "pkg" / "sub" / "mod.pyc").write_bytes(b"\0" * 17)
+    (internal / "lib.txt").write_bytes(b"sorts after lib/ component-wise\n")
+    lib = internal / "lib" / "libfoo.so.1"
+    lib.write_bytes(b"\x7fELF" + b"\0" * 60)
+    lib.chmod(0o755)
+    try:
+        os.symlink("libfoo.so.1", internal / "lib" / "libfoo.so")
+    except (OSError, NotImplementedError):
+        pass  # no symlink privilege (Windows)
+    return cgp
+
+
+def _legacy_runtime_version(internal_dir: Path) -> str:
+    """RUNTIME_VERSION as computed before the os.scandir rewrite."""
+    entries = []
+    for f in sorted(internal_dir.rglob("*")):
+        if f.is_file() and f.name != "RUNTIME_VERSION":
+            entries.append(f"{f.relative_to(internal_dir)}:{f.stat().st_size}")
+    return hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()[:16]
+
+
+def _legacy_members(cgp: Path) -> Dict[str, List[str]]:
+    """Tar member names (in order) the rglob-based packaging produced, deduplicated.
+
+    The old loop called tf.add() on every sorted rglob entry, and tf.add()
+    recursed into directories (children in sorted(os.listdir) order), so
+    files were stored once per ancestor; only the first occurrence counts here.
+    """
+    def add(p: Path, out: List[Path]) -> None:
+        out.append(p)
+        if p.is_dir() and not p.is_symlink():
+            for name in sorted(os.listdir(p)):
+                add(p / name, out)
+
+    def legacy(keep) -> List[str]:
+        added: List[Path] = []
+        for p in sorted(cgp.rglob("*")):
+            if keep(p.relative_to(cgp).parts):
+                add(p, added)
+        names = ["cgp/" + p.relative_to(cgp).as_posix() for p in added]
+        return list(dict.fromkeys(names))
+
+    return {
+        "full": legacy(lambda parts: True),
+        "app": legacy(lambda parts: parts[0] != "_internal"),
+        "runtime": legacy(lambda parts: not (
+            len(parts) == 1 and parts[0] != "_internal" and (cgp / parts[0]).is_file()
+        )),
+    }
+
+
+def _run(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, platform: str) -> Path:
+    out = tmp_path / "out"
+    monkeypatch.setattr(post_build, "_has_strip", lambda: False)
+    monkeypatch.setattr(sys, "argv", ["post_build.py", str(tmp_path / "dist"), str(out), platform])
+    post_build.main()
+    return out
+
+
+def _archive_name(kind: str, platform: str, suffix: str) -> str:
+    infix = "" if kind == "full" else f"{kind}-"
+    return f"cgp-{infix}{platform}.{suffix}"
+
+
+def test_tar_archives_match_legacy_layout(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    cgp = _make_dist(tmp_path)
+    internal = cgp / "_internal"
+    expected_rv = _legacy_runtime_version(internal)
+
+    out = _run(monkeypatch, tmp_path, "linux-x86_64")
+
+    assert (internal / "RUNTIME_VERSION").read_text(encoding="utf-8") == expected_rv + "\n"
+    expected = _legacy_members(cgp)
+    for kind, names in expected.items():
+        with tarfile.open(out / _archive_name(kind, "linux-x86_64", "tar.gz")) as tf:
+            members = tf.getmembers()
+            assert [m.name for m in members] == names, kind
+            for m in members:
+                src = cgp / m.name[len("cgp/"):]
+                st = os.lstat(src)
+                assert m.mode == stat.S_IMODE(st.st_mode), m.name
+                if stat.S_ISLNK(st.st_mode):
+                    assert m.issym() and m.linkname == os.readlink(src)
+                elif stat.S_ISDIR(st.st_mode):
+                    assert m.isdir(), m.name
+                else:
+                    assert m.isreg()
+                    assert tf.extractfile(m).read() == src.read_bytes(), m.name
+            if kind != "app":
+                empty = tf.getmember("cgp/_internal/empty")
+                assert empty.isdir()
+            if kind == "runtime":
+                rv = tf.extractfile("cgp/_internal/RUNTIME_VERSION").read()
+                assert rv == (expected_rv + "\n").encode("utf-8")
+
+
+def test_summary_lines_print_in_fixed_order(monkeypatch: pytest.MonkeyPatch, tmp_path: Path,
+                                            capsys: pytest.CaptureFixture):
+    _make_dist(tmp_path)
+    _run(monkeypatch, tmp_path, "linux-x86_64")
+    lines = [ln.split()[0] for ln in capsys.readouterr().err.splitlines()
+             if ln.lstrip().startswith(("Full:", "App:", "Runtime:"))]
+    assert lines == ["Full:", "App:", "Runtime:"]
+
+
+def test_zip_archives_match_legacy_layout(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    cgp = _make_dist(tmp_path)
+    internal = cgp / "_internal"
+    expected_rv = _legacy_runtime_version(internal)
+
+    out = _run(monkeypatch, tmp_path, "windows-x86_64")
+
+    assert (internal / "RUNTIME_VERSION").read_text(encoding="utf-8") == expected_rv + "\n"
+    expected = _legacy_members(cgp)
+    for kind, names in expected.items():
+        # Zip archives only ever held files.
+        names = [n for n in names if (cgp / n[len("cgp/"):]).is_file()]
+        with zipfile.ZipFile(out / _archive_name(kind, "windows-x86_64", "zip")) as zf:
+            assert zf.namelist() == names, kind
+            for name in names:
+                # Symlinked files are stored with their target's bytes.
+                assert zf.read(name) == (cgp / name[len("cgp/"):]).read_bytes(), name
@@ -2,13 +2,27 @@
 
 from __future__ import annotations
 
+import sys
+from contextlib import contextmanager
 from pathlib import Path, PurePosixPath
+from typing import Iterator
 from unittest import mock
 
 from cursor_gui_patch.macos_privacy import ProcessContext
 from cursor_gui_patch.report import CodesignInfo, PatchReport, StatusReport, UnpatchReport
 
 
+@contextmanager
+def _platform(name: str) -> Iterator[None]:
+    """Set sys.platform (shared by report and macos_privacy) for the block."""
+    old = sys.platform
+    sys.platform = name
+    try:
+        yield
+    finally:
+        sys.platform = old
+
+
 def _app_js() -> PurePosixPath:
     return PurePosixPath(
         "/Applications/Cursor.app/Contents/Resources/app/out/vs/workbench/workbench.desktop.main.js"
@@ -30,13 +44,13 @@ class TestPatchReportSummary:
 
     def test_includes_permission_hint_on_linux(self):
         report = PatchReport(errors=[(Path("/tmp/main.js"), "Permission denied")])
-        with mock.patch("cursor_gui_patch.report.sys.platform", "linux"):
+        with _platform("linux"):
             s = report.summary()
         assert "sudo cgp patch" in s
 
     def test_includes_permission_hint_on_windows(self):
         report = PatchReport(errors=[(Path("C:/x.js"), "Access is denied")])
-        with mock.patch("cursor_gui_patch.report.sys.platform", "win32"):
+        with _platform("win32"):
             s = report.summary()
         assert "Run as Administrator" in s
 
@@ -57,7 +71,7 @@ class TestPatchReportSummary:
                 warning="preferred identity failed; fell back to ad-hoc signature",
             )]
         )
-        with mock.patch("cursor_gui_patch.report.sys.platform", "darwin"):
+        with _platform("darwin"):
             s = report.summary()
         assert "identity: -" in s
         assert "Codesign TIP: set CGP_CODESIGN_IDENTITY" in s
@@ -71,7 +85,7 @@ class TestPatchReportSummary:
                 identity="CGP Cursor Patch",
             )]
         )
-        with mock.patch("cursor_gui_patch.report.sys.platform", "darwin"):
+        with _platform("darwin"):
             s = report.summary()
         assert "macOS Keychain / Signature" in s
         assert "Best practice:" in s
@@ -88,7 +102,7 @@ class TestPatchReportSummary:
                 identity="CGP Cursor Patch",
             )]
         )
-        with mock.patch("cursor_gui_patch.report.sys.platform", "linux"):
+        with _platform("linux"):
             s = report.summary()
         assert "macOS Keychain / Signature" not in s
 
@@ -99,7 +113,7 @@ class TestPatchReportSummary:
             errors=[],
             codesign=[],
         )
-        with mock.patch("cursor_gui_patch.report.sys.platform", "darwin"):
+        with _platform("darwin"):
             s = report.summary()
         assert "macOS Keychain note:" in s
         assert "not re-signed" in s
@@ -113,7 +127,7 @@ class TestPatchReportSummary:
                 identity="-",
             )],
         )
-        with mock.patch("cursor_gui_patch.report.sys.platform", "darwin"):
+        with _platform("darwin"):
             s = report.summary()
         assert "Official signature restore:" in s
         assert "file-level restore + re-sign" in s
@@ -128,8 +142,7 @@ class TestPatchReportSummary:
                 "backup failed: [Errno 1] Operation not permitted",
             )]
         )
-        with mock.patch("cursor_gui_patch.report.sys.platform", "darwin"), \
-             mock.patch("cursor_gui_patch.macos_privacy.sys.platform", "darwin"), \
+        with _platform("darwin"), \
              mock.patch(
                  "cursor_gui_patch.report.detect_current_process_context",
                  return_value=ProcessContext(
@@ -150,7 +163,7 @@ class TestPatchReportSummary:
 
     def test_does_not_treat_operation_not_permitted_as_generic_permission_on_linux(self):
         report = PatchReport(errors=[(Path("/tmp/main.js"), "operation not permitted")])
-        with mock.patch("cursor_gui_patch.report.sys.platform", "linux"):
+        with _platform("linux"):
             s = report.summary()
         assert "Fix: Run with elevated permissions" not in s
 
@@ -168,7 +181,7 @@ class TestUnpatchReportSummary:
             no_backup=[_app_ext_js()],
             errors=[],
         )
-        with mock.patch("cursor_gui_patch.report.sys.platform", "darwin"):
+        with _platform("darwin"):
             s = report.summary()
         assert "macOS restore hint:" in s
         assert "older cgp versions" in s
@@ -180,7 +193,7 @@ class TestUnpatchReportSummary:
             no_backup=[Path("/tmp/not-cursor/main.js")],
             errors=[],
         )
-        with mock.patch("cursor_gui_patch.report.sys.platform", "darwin"):
+        with _platform("darwin"):
             s = report.summary()
         assert "macOS restore hint:" not in s
 
@@ -190,13 +203,13 @@ class TestUnpatchReportSummary:
             no_backup=[_app_ext_js()],
             errors=[],
         )
-        with mock.patch("cursor_gui_patch.report.sys.platform", "win32"):
+        with _platform("win32"):
             s = report.summary()
         assert "macOS restore hint:" not in s
 
     def test_includes_permission_hint_on_linux(self):
         report = UnpatchReport(errors=[(Path("/tmp/main.js"), "errno 13")])
-        with mock.patch("cursor_gui_patch.report.sys.platform", "linux"):
+        with _platform("linux"):
             s = report.summary()
         assert "sudo cgp unpatch" in s
 
@@ -207,8 +220,7 @@ class TestUnpatchReportSummary:
                 "operation not permitted: [Errno 1] Operation not permitted",
             )]
         )
-        with mock.patch("cursor_gui_patch.report.sys.platform", "darwin"), \
-             mock.patch("cursor_gui_patch.macos_privacy.sys.platform", "darwin"), \
+        with _platform("darwin"), \
              mock.patch(
                  "cursor_gui_patch.report.detect_current_process_context",
                  return_value=ProcessContext(
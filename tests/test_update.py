@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
-import json
-import time
+import dataclasses
 from pathlib import Path
+from types import SimpleNamespace
 from unittest import mock
 
 import pytest
 
+from cursor_gui_patch import __version__
+from cursor_gui_patch import update as U
 from cursor_gui_patch.update import (
     UPDATE_CHECK_INTERVAL_S,
     UpdateStatus,
@@ -20,135 +22,161 @@ from cursor_gui_patch.update import (
     perform_update,
 )
 
+_BODY_V020 = b'{"tag_name": "v0.2.0"}'
+_BODY_CURRENT = b'{"tag_name": "v' + __version__.encode() + b'"}'
+
+# Fixed wall clock for the update-check interval tests.
+_NOW = 1_700_000_000.0
+
 
 class TestShouldCheckUpdate:
     def test_no_file(self, tmp_path: Path):
-        with mock.patch("cursor_gui_patch.update._last_check_path", return_value=tmp_path / "nofile"):
+        with mock.patch.object(U, "_last_check_path", return_value=tmp_path / "nofile"):
             assert _should_check_update() is True
 
-    def test_recent_check(self, tmp_path: Path):
+    def test_recent_check(self, monkeypatch):
+        monkeypatch.setattr(U, "time", SimpleNamespace(time=lambda: _NOW))
+        monkeypatch.setattr(U, "_read_last_check_ts", lambda: _NOW - 1)
+        assert _should_check_update() is False
+
+    def test_old_check(self, monkeypatch):
+        monkeypatch.setattr(U, "time", SimpleNamespace(time=lambda: _NOW))
+        monkeypatch.setattr(U, "_read_last_check_ts", lambda: _NOW - UPDATE_CHECK_INTERVAL_S - 10)
+        assert _should_check_update() is True
+
+    def test_reads_recorded_timestamp(self, tmp_path: Path):
         p = tmp_path / ".last-update-check"
-        p.write_text(str(time.time()), encoding="utf-8")
-        with mock.patch("cursor_gui_patch.update._last_check_path", return_value=p):
-            assert _should_check_update() is False
+        p.write_text("1700000000.5\n", encoding="utf-8")
+        with mock.patch.object(U, "_last_check_path", return_value=p):
+            assert U._read_last_check_ts() == 1700000000.5
 
-    def test_old_check(self, tmp_path: Path):
+    def test_unreadable_timestamp_is_none(self, tmp_path: Path):
         p = tmp_path / ".last-update-check"
-        p.write_text(str(time.time() - UPDATE_CHECK_INTERVAL_S - 10), encoding="utf-8")
-        with mock.patch("cursor_gui_patch.update._last_check_path", return_value=p):
+        p.write_text("garbage", encoding="utf-8")
+        with mock.patch.object(U, "_last_check_path", return_value=p):
+            assert U._read_last_check_ts() is None
             assert _should_check_update() is True
 
 
-class TestCheckForUpdate:
-    def test_not_frozen(self):
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=False):
-            result = check_for_update()
-            assert result is not None
-            assert result.supported is False
-            assert "not a frozen binary" in (result.error or "")
+@pytest.fixture
+def frozen_update(monkeypatch, tmp_path: Path):
+    """Pretend to run as a frozen linux binary with the check timestamp in tmp_path."""
+    monkeypatch.setattr(U, "is_frozen_binary", lambda: True)
+    monkeypatch.setattr(U, "select_release_asset_name", lambda: "cgp-linux-x86_64.tar.gz")
+    monkeypatch.setattr(U, "_last_check_path", lambda: tmp_path / ".ts")
 
-    def test_frozen_newer_available(self, tmp_path: Path):
-        body = json.dumps({"tag_name": "v0.2.0"}).encode()
 
+@pytest.mark.usefixtures("frozen_update")
+class TestCheckForUpdate:
+    def test_not_frozen(self, monkeypatch):
+        monkeypatch.setattr(U, "is_frozen_binary", lambda: False)
+        result = check_for_update()
+        assert result is not None
+        assert result.supported is False
+        assert "not a frozen binary" in (result.error or "")
+
+    def test_frozen_newer_available(self):
         def fake_fetch(url, timeout_s, headers):
-            return body
-
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=True), \
-             mock.patch("cursor_gui_patch.update.select_release_asset_name", return_value="cgp-linux-x86_64.tar.gz"), \
-             mock.patch("cursor_gui_patch.update._last_check_path", return_value=tmp_path / ".ts"):
-            result = check_for_update(fetch=fake_fetch)
-            assert result is not None
-            assert result.update_available is True
-            assert result.remote_version == "0.2.0"
+            return _BODY_V020
 
-    def test_frozen_same_version(self, tmp_path: Path):
-        from cursor_gui_patch import __version__
-        body = json.dumps({"tag_name": f"v{__version__}"}).encode()
+        result = check_for_update(fetch=fake_fetch)
+        assert result is not None
+        assert result.update_available is True
+        assert result.remote_version == "0.2.0"
 
+    def test_frozen_same_version(self):
         def fake_fetch(url, timeout_s, headers):
-            return body
+            return _BODY_CURRENT
 
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=True), \
-             mock.patch("cursor_gui_patch.update.select_release_asset_name", return_value="cgp-linux-x86_64.tar.gz"), \
-             mock.patch("cursor_gui_patch.update._last_check_path", return_value=tmp_path / ".ts"):
-            result = check_for_update(fetch=fake_fetch)
-            assert result is not None
-            assert result.update_available is False
+        result = check_for_update(fetch=fake_fetch)
+        assert result is not None
+        assert result.update_available is False
 
-    def test_network_error(self, tmp_path: Path):
+    def test_network_error(self):
         def failing_fetch(url, timeout_s, headers):
             raise ConnectionError("no internet")
 
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=True), \
-             mock.patch("cursor_gui_patch.update._last_check_path", return_value=tmp_path / ".ts"):
-            result = check_for_update(fetch=failing_fetch)
-            assert result is not None
-            assert result.supported is False
-            assert "no internet" in (result.error or "")
+        result = check_for_update(fetch=failing_fetch)
+        assert result is not None
+        assert result.supported is False
+        assert "no internet" in (result.error or "")
+
+
+class TestResolveInstallDirs:
+    @pytest.mark.parametrize("platform, exe_name", [("linux", "cgp"), ("win32", "cgp.exe")])
+    def test_root_dir_from_current_layout(self, tmp_path: Path, monkeypatch, platform, exe_name):
+        monkeypatch.setenv("CGP_INSTALL_DEST", str(tmp_path / "bin"))
+        monkeypatch.delenv("CGP_INSTALL_ROOT", raising=False)
+        monkeypatch.setattr(U.sys, "platform", platform)
+        exe = tmp_path / "root" / "current" / "cgp" / exe_name
+        monkeypatch.setattr(U, "_resolved_executable", lambda: exe)
+
+        _, root_dir = U._resolve_install_dirs(None)
+
+        assert root_dir == tmp_path / "root"
 
 
 class TestAutoUpdateIfNeeded:
     def test_skips_if_not_frozen(self):
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=False):
+        with mock.patch.object(U, "is_frozen_binary", return_value=False):
             auto_update_if_needed(["cgp", "patch"])
             # Should return without doing anything
 
     def test_skips_if_env_set(self):
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=True), \
+        with mock.patch.object(U, "is_frozen_binary", return_value=True), \
              mock.patch.dict("os.environ", {"CGP_NO_AUTO_UPDATE": "1"}):
             auto_update_if_needed(["cgp", "patch"])
 
     def test_skips_if_already_updated(self):
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=True), \
+        with mock.patch.object(U, "is_frozen_binary", return_value=True), \
              mock.patch.dict("os.environ", {"_CGP_UPDATED": "1"}, clear=False):
             auto_update_if_needed(["cgp", "patch"])
 
     def test_skips_if_recent_check(self):
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=True), \
+        with mock.patch.object(U, "is_frozen_binary", return_value=True), \
              mock.patch.dict("os.environ", {}, clear=False), \
-             mock.patch("cursor_gui_patch.update._should_check_update", return_value=False):
+             mock.patch.object(U, "_should_check_update", return_value=False):
             auto_update_if_needed(["cgp", "patch"])
 
 
+@pytest.mark.usefixtures("frozen_update")
 class TestPerformUpdate:
-    def test_not_frozen(self):
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=False):
-            ok, msg = perform_update()
-            assert ok is False
-            assert "not a frozen binary" in msg
+    def test_not_frozen(self, monkeypatch):
+        monkeypatch.setattr(U, "is_frozen_binary", lambda: False)
+        ok, msg = perform_update()
+        assert ok is False
+        assert "not a frozen binary" in msg
 
     def test_app_only_path(self, tmp_path: Path):
         rel = mock.Mock(tag="v0.2.0", version="0.2.0")
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=True), \
-             mock.patch("cursor_gui_patch.update.get_github_repo", return_value="owner/repo"), \
-             mock.patch("cursor_gui_patch.update.fetch_latest_release", return_value=rel), \
-             mock.patch(
-                 "cursor_gui_patch.update._resolve_install_dirs",
+        with mock.patch.object(U, "get_github_repo", return_value="owner/repo"), \
+             mock.patch.object(U, "fetch_latest_release", return_value=rel), \
+             mock.patch.object(
+                 U, "_resolve_install_dirs",
                  return_value=(tmp_path / "bin", tmp_path / "root"),
              ), \
-             mock.patch("cursor_gui_patch.update._try_app_only_update", return_value="app-only"), \
-             mock.patch("cursor_gui_patch.update.download_and_install_release_bundle") as full_update:
+             mock.patch.object(U, "read_local_runtime_version", return_value="abc123"), \
+             mock.patch.object(
+                 U, "_try_app_only_update", return_value="app-only",
+             ) as app_only, \
+             mock.patch.object(U, "download_and_install_release_bundle") as full_update:
             ok, msg = perform_update()
 
         assert ok is True
         assert "app-only" in msg
+        assert app_only.call_args.kwargs["local_rv"] == "abc123"
         full_update.assert_not_called()
 
     def test_full_update_path(self, tmp_path: Path):
         rel = mock.Mock(tag="v0.2.0", version="0.2.0")
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=True), \
-             mock.patch("cursor_gui_patch.update.get_github_repo", return_value="owner/repo"), \
-             mock.patch("cursor_gui_patch.update.fetch_latest_release", return_value=rel), \
-             mock.patch(
-                 "cursor_gui_patch.update._resolve_install_dirs",
+        with mock.patch.object(U, "get_github_repo", return_value="owner/repo"), \
+             mock.patch.object(U, "fetch_latest_release", return_value=rel), \
+             mock.patch.object(
+                 U, "_resolve_install_dirs",
                  return_value=(tmp_path / "bin", tmp_path / "root"),
              ), \
-             mock.patch("cursor_gui_patch.update._try_app_only_update", return_value=None), \
-             mock.patch(
-                 "cursor_gui_patch.update.select_release_asset_name",
-                 return_value="cgp-linux-x86_64.tar.gz",
-             ), \
-             mock.patch("cursor_gui_patch.update.download_and_install_release_bundle") as full_update:
+             mock.patch.object(U, "_try_app_only_update", return_value=None), \
+             mock.patch.object(U, "download_and_install_release_bundle") as full_update:
             ok, msg = perform_update()
 
         assert ok is True
@@ -156,85 +184,67 @@ class TestPerformUpdate:
         full_update.assert_called_once()
 
     def test_returns_error_on_exception(self):
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=True), \
-             mock.patch("cursor_gui_patch.update.get_github_repo", return_value="owner/repo"), \
-             mock.patch("cursor_gui_patch.update.fetch_latest_release", side_effect=RuntimeError("boom")):
+        with mock.patch.object(U, "get_github_repo", return_value="owner/repo"), \
+             mock.patch.object(U, "fetch_latest_release", side_effect=RuntimeError("boom")):
             ok, msg = perform_update()
 
         assert ok is False
         assert "boom" in msg
 
 
+@pytest.fixture
+def base_status() -> UpdateStatus:
+    return UpdateStatus(
+        supported=True,
+        method="github_release",
+        installed_version="0.1.0",
+        remote_version="0.2.0",
+        repo="owner/repo",
+        asset_name="cgp-linux-x86_64.tar.gz",
+        update_available=True,
+        error=None,
+    )
+
+
 class TestAutoUpdateExec:
-    def test_reexecs_on_unix_after_successful_update(self):
-        status = UpdateStatus(
-            supported=True,
-            method="github_release",
-            installed_version="0.1.0",
-            remote_version="0.2.0",
-            repo="owner/repo",
-            asset_name="cgp-linux-x86_64.tar.gz",
-            update_available=True,
-            error=None,
-        )
-
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=True), \
+    def test_reexecs_on_unix_after_successful_update(self, base_status):
+        with mock.patch.object(U, "is_frozen_binary", return_value=True), \
              mock.patch.dict("os.environ", {}, clear=False), \
-             mock.patch("cursor_gui_patch.update._should_check_update", return_value=True), \
-             mock.patch("cursor_gui_patch.update.check_for_update", return_value=status), \
-             mock.patch("cursor_gui_patch.update.perform_update", return_value=(True, "ok")), \
-             mock.patch("cursor_gui_patch.update.sys.platform", "linux"), \
-             mock.patch("cursor_gui_patch.update.os.execvp", side_effect=RuntimeError("reexec")) as execvp:
+             mock.patch.object(U, "_should_check_update", return_value=True), \
+             mock.patch.object(U, "check_for_update", return_value=base_status), \
+             mock.patch.object(U, "perform_update", return_value=(True, "ok")), \
+             mock.patch.object(U.sys, "platform", "linux"), \
+             mock.patch.object(U.os, "execvp", side_effect=RuntimeError("reexec")) as execvp:
             with pytest.raises(RuntimeError, match="reexec"):
                 auto_update_if_needed(["cgp", "status"])
 
         execvp.assert_called_once()
 
-    def test_reexecs_on_windows_after_successful_update(self):
-        status = UpdateStatus(
-            supported=True,
-            method="github_release",
-            installed_version="0.1.0",
-            remote_version="0.2.0",
-            repo="owner/repo",
-            asset_name="cgp-windows-x86_64.zip",
-            update_available=True,
-            error=None,
-        )
-
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=True), \
+    def test_reexecs_on_windows_after_successful_update(self, base_status):
+        status = dataclasses.replace(base_status, asset_name="cgp-windows-x86_64.zip")
+
+        with mock.patch.object(U, "is_frozen_binary", return_value=True), \
              mock.patch.dict("os.environ", {}, clear=False), \
-             mock.patch("cursor_gui_patch.update._should_check_update", return_value=True), \
-             mock.patch("cursor_gui_patch.update.check_for_update", return_value=status), \
-             mock.patch("cursor_gui_patch.update.perform_update", return_value=(True, "ok")), \
-             mock.patch("cursor_gui_patch.update.sys.platform", "win32"), \
-             mock.patch("cursor_gui_patch.update.subprocess.call", return_value=7), \
-             mock.patch("cursor_gui_patch.update.sys.exit", side_effect=SystemExit(7)) as exit_mock:
+             mock.patch.object(U, "_should_check_update", return_value=True), \
+             mock.patch.object(U, "check_for_update", return_value=status), \
+             mock.patch.object(U, "perform_update", return_value=(True, "ok")), \
+             mock.patch.object(U.sys, "platform", "win32"), \
+             mock.patch.object(U.subprocess, "call", return_value=7), \
+             mock.patch.object(U.sys, "exit", side_effect=SystemExit(7)) as exit_mock:
             with pytest.raises(SystemExit) as ex:
                 auto_update_if_needed(["cgp", "status"])
 
         assert ex.value.code == 7
         exit_mock.assert_called_once_with(7)
 
-    def test_no_reexec_when_update_fails(self):
-        status = UpdateStatus(
-            supported=True,
-            method="github_release",
-            installed_version="0.1.0",
-            remote_version="0.2.0",
-            repo="owner/repo",
-            asset_name="cgp-linux-x86_64.tar.gz",
-            update_available=True,
-            error=None,
-        )
-
-        with mock.patch("cursor_gui_patch.update.is_frozen_binary", return_value=True), \
+    def test_no_reexec_when_update_fails(self, base_status):
+        with mock.patch.object(U, "is_frozen_binary", return_value=True), \
              mock.patch.dict("os.environ", {}, clear=False), \
-             mock.patch("cursor_gui_patch.update._should_check_update", return_value=True), \
-             mock.patch("cursor_gui_patch.update.check_for_update", return_value=status), \
-             mock.patch("cursor_gui_patch.update.perform_update", return_value=(False, "boom")), \
-             mock.patch("cursor_gui_patch.update.os.execvp") as execvp, \
-             mock.patch("cursor_gui_patch.update.subprocess.call") as sp_call:
+             mock.patch.object(U, "_should_check_update", return_value=True), \
+             mock.patch.object(U, "check_for_update", return_value=base_status), \
+             mock.patch.object(U, "perform_update", return_value=(False, "boom")), \
+             mock.patch.object(U.os, "execvp") as execvp, \
+             mock.patch.object(U.subprocess, "call") as sp_call:
             auto_update_if_needed(["cgp", "status"])
 
         execvp.assert_not_called()